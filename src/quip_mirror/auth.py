@@ -6,12 +6,14 @@ from various sources including command line, environment variables, and config f
 """
 
 import os
+import sys
+import stat
+import time
 import getpass
+import hashlib
 import logging
 from pathlib import Path
-from typing import Optional, Tuple
-
-from .quip_client import QuipAPIClient
+from typing import Dict, Optional, Tuple
 
 
 logger = logging.getLogger(__name__)
@@ -28,11 +30,70 @@ class TokenManager:
     TOKEN_ENV_VAR = "QUIP_ACCESS_TOKEN"
     TOKEN_CONFIG_FILE = "~/.quip_token"
     TOKEN_URL = "https://quip-amazon.com/dev/token"
+    VALIDATION_CACHE_TTL = 300  # Seconds a successful validation is reused
+    
+    # Static user-facing text, formatted once at class creation
+    _NO_TOKEN_MESSAGE = (
+        "No Quip access token found. Please provide a token using one of these methods:\n"
+        f"  1. Command line: --token YOUR_TOKEN\n"
+        f"  2. Environment variable: export {TOKEN_ENV_VAR}=YOUR_TOKEN\n"
+        f"  3. Configuration file: echo 'YOUR_TOKEN' > {TOKEN_CONFIG_FILE}\n"
+        f"  4. Interactive prompt (will be shown automatically)\n\n"
+        f"Get your token at: {TOKEN_URL}"
+    )
+    
+    _TOKEN_GUIDANCE = """
+Quip Access Token Setup Guide
+============================
+
+To use this tool, you need a Quip personal access token.
+
+Step 1: Get Your Token
+---------------------
+Visit: {TOKEN_URL}
+Click "Generate" to create a new personal access token
+Copy the generated token
+
+Step 2: Configure Your Token
+----------------------------
+Choose one of these methods:
+
+Method 1 - Environment Variable (Recommended):
+  export {TOKEN_ENV_VAR}=YOUR_TOKEN_HERE
+
+Method 2 - Configuration File:
+  echo "YOUR_TOKEN_HERE" > {TOKEN_CONFIG_FILE}
+
+Method 3 - Command Line Argument:
+  quip-mirror --token YOUR_TOKEN_HERE <folder_url> <target_path>
+
+Method 4 - Interactive Prompt:
+  The tool will prompt you automatically if no token is found
+
+Security Notes:
+--------------
+- Keep your token secure and don't share it
+- The token provides access to all your Quip content
+- Configuration file permissions are automatically set to owner-only
+- Tokens can be regenerated if compromised
+
+Troubleshooting:
+---------------
+- Ensure the token hasn't expired
+- Verify you have access to the Quip folder you're trying to mirror
+- Check your network connection to quip-amazon.com
+""".format(
+        TOKEN_URL=TOKEN_URL,
+        TOKEN_ENV_VAR=TOKEN_ENV_VAR,
+        TOKEN_CONFIG_FILE=TOKEN_CONFIG_FILE
+    )
     
     def __init__(self):
         """Initialize the token manager."""
         self.discovered_token: Optional[str] = None
         self.token_source: Optional[str] = None
+        self._config_cache: Optional[Tuple[Tuple[int, int], str]] = None
+        self._validation_cache: Dict[str, Tuple[bool, str, float]] = {}
     
     def discover_token(self, cli_token: Optional[str] = None) -> Tuple[Optional[str], str]:
         """
@@ -85,14 +146,7 @@ class TokenManager:
             return interactive_token, "interactive prompt"
         
         # No token found
-        raise AuthenticationError(
-            "No Quip access token found. Please provide a token using one of these methods:\n"
-            f"  1. Command line: --token YOUR_TOKEN\n"
-            f"  2. Environment variable: export {self.TOKEN_ENV_VAR}=YOUR_TOKEN\n"
-            f"  3. Configuration file: echo 'YOUR_TOKEN' > {self.TOKEN_CONFIG_FILE}\n"
-            f"  4. Interactive prompt (will be shown automatically)\n\n"
-            f"Get your token at: {self.TOKEN_URL}"
-        )
+        raise AuthenticationError(self._NO_TOKEN_MESSAGE)
     
     def validate_token(self, token: str) -> Tuple[bool, str]:
         """
@@ -112,14 +166,25 @@ class TokenManager:
         if len(token) < 10:
             return False, "Token appears to be too short"
         
+        # Reuse a recent successful validation; keyed by hash so the cache holds no plaintext tokens
+        cache_key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        cached = self._validation_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[2] < self.VALIDATION_CACHE_TTL:
+            logger.debug("Using cached token validation result")
+            return cached[0], cached[1]
+        
         try:
+            from .quip_client import QuipAPIClient
+            
             # Test the token by creating a client and testing connection
             client = QuipAPIClient(token)
             is_valid, message = client.test_connection()
             
             if is_valid:
                 logger.debug("Token validation successful")
-                return True, "Token is valid and authenticated successfully"
+                result = (True, "Token is valid and authenticated successfully")
+                self._validation_cache[cache_key] = (result[0], result[1], time.monotonic())
+                return result
             else:
                 logger.warning(f"Token validation failed: {message}")
                 return False, f"Token validation failed: {message}"
@@ -139,14 +204,23 @@ class TokenManager:
         try:
             config_path = Path(self.TOKEN_CONFIG_FILE).expanduser()
             
-            if not config_path.exists():
+            try:
+                file_stat = config_path.stat()
+            except FileNotFoundError:
                 logger.debug(f"Configuration file not found: {config_path}")
                 return None
             
-            if not config_path.is_file():
+            if not stat.S_ISREG(file_stat.st_mode):
                 logger.warning(f"Configuration path exists but is not a file: {config_path}")
                 return None
             
+            # Reuse the previously read token if the file hasn't changed; nanosecond
+            # mtime plus size catches edits within one coarse timestamp tick
+            file_key = (file_stat.st_mtime_ns, file_stat.st_size)
+            if self._config_cache is not None and self._config_cache[0] == file_key:
+                logger.debug(f"Using cached token from configuration file: {config_path}")
+                return self._config_cache[1]
+            
             # Read token from file
             token = config_path.read_text().strip()
             
@@ -157,6 +231,7 @@ class TokenManager:
             # Take only the first line in case there are multiple lines
             token = token.split('\n')[0].strip()
             
+            self._config_cache = (file_key, token)
             logger.debug(f"Read token from configuration file: {config_path}")
             return token
             
@@ -171,6 +246,11 @@ class TokenManager:
         Returns:
             Token string if provided, None if cancelled
         """
+        # Fail fast in pipelines and CI rather than blocking on input
+        if not sys.stdin or not sys.stdin.isatty():
+            logger.debug("stdin is not a TTY, skipping interactive token prompt")
+            return None
+        
         try:
             print("\n" + "=" * 60)
             print("Quip Access Token Required")
@@ -248,52 +328,14 @@ class TokenManager:
         Returns:
             Formatted guidance text
         """
-        return f"""
-Quip Access Token Setup Guide
-============================
-
-To use this tool, you need a Quip personal access token.
-
-Step 1: Get Your Token
----------------------
-Visit: {self.TOKEN_URL}
-Click "Generate" to create a new personal access token
-Copy the generated token
-
-Step 2: Configure Your Token
-----------------------------
-Choose one of these methods:
-
-Method 1 - Environment Variable (Recommended):
-  export {self.TOKEN_ENV_VAR}=YOUR_TOKEN_HERE
-
-Method 2 - Configuration File:
-  echo "YOUR_TOKEN_HERE" > {self.TOKEN_CONFIG_FILE}
-
-Method 3 - Command Line Argument:
-  quip-mirror --token YOUR_TOKEN_HERE <folder_url> <target_path>
-
-Method 4 - Interactive Prompt:
-  The tool will prompt you automatically if no token is found
-
-Security Notes:
---------------
-- Keep your token secure and don't share it
-- The token provides access to all your Quip content
-- Configuration file permissions are automatically set to owner-only
-- Tokens can be regenerated if compromised
-
-Troubleshooting:
----------------
-- Ensure the token hasn't expired
-- Verify you have access to the Quip folder you're trying to mirror
-- Check your network connection to quip-amazon.com
-"""
+        return self._TOKEN_GUIDANCE
     
     def clear_cached_token(self) -> None:
         """Clear any cached token information."""
         self.discovered_token = None
         self.token_source = None
+        self._config_cache = None
+        self._validation_cache.clear()
     
     def get_current_token_info(self) -> Tuple[Optional[str], Optional[str]]:
         """
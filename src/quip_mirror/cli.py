@@ -5,39 +5,143 @@ This module provides the main CLI application that coordinates all components
 to perform the folder mirroring operation.
 """
 
+import os
 import sys
 import argparse
+import functools
 import logging
-from pathlib import Path
 from typing import List, Optional
 
 from .models import MirrorConfig, ProcessingSummary
-from .quip_client import QuipAPIClient, QuipAPIError
 from .auth import TokenManager, AuthenticationError
-from .traverser import FolderTraverser, TraversalError
-from .filesystem import FileSystemManager, FileSystemError
-from .converter import DocumentConverter, ConversionError
-from .progress import ProgressReporter
 
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stderr)
-    ]
-)
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser once and reuse it for subsequent parses."""
+    parser = argparse.ArgumentParser(
+        description="Mirror Quip folders to local filesystem with Word document export",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s https://quip-amazon.com/folder/ABC123 ./local-mirror
+  %(prog)s --token YOUR_TOKEN https://quip-amazon.com/folder/ABC123 ./docs
+  
+Authentication:
+  The tool looks for your Quip access token in this order:
+  1. --token command line argument
+  2. QUIP_ACCESS_TOKEN environment variable  
+  3. ~/.quip_token configuration file
+  4. Interactive prompt
+  
+  Get your token at: https://quip-amazon.com/dev/token
+        """
+    )
+    
+    # Positional arguments
+    parser.add_argument(
+        "quip_folder_url",
+        help="URL of the Quip folder to mirror (must start with https://quip-amazon.com/)"
+    )
+    
+    parser.add_argument(
+        "target_path",
+        help="Local directory where the mirrored structure will be created"
+    )
+    
+    # Optional arguments
+    parser.add_argument(
+        "--token",
+        help="Quip personal access token (overrides environment and config file)"
+    )
+    
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        default=True,
+        help="Overwrite existing files (default: True)"
+    )
+    
+    parser.add_argument(
+        "--no-overwrite",
+        action="store_false",
+        dest="overwrite",
+        help="Do not overwrite existing files"
+    )
+    
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Enable verbose output"
+    )
+    
+    parser.add_argument(
+        "--quiet", "-q",
+        action="store_true",
+        help="Suppress progress output"
+    )
+    
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show what would be done without actually doing it"
+    )
+    
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=50,
+        help="Maximum folder traversal depth (default: 50)"
+    )
+    
+    parser.add_argument(
+        "--timeout",
+        type=int,
+        default=30,
+        help="API request timeout in seconds (default: 30)"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Number of folders to fetch and documents to export concurrently (default: 8)"
+    )
+    
+    parser.add_argument(
+        "--no-cache",
+        action="store_false",
+        dest="use_folder_cache",
+        help="Ignore cached folder listings and fetch every folder in full"
+    )
+    
+    parser.add_argument(
+        "--version",
+        action="version",
+        version="%(prog)s 0.1.0"
+    )
+    
+    return parser
+
+
 class QuipMirrorCLI:
     """Main CLI application for Quip Folder Mirror."""
     
     def __init__(self):
         """Initialize the CLI application."""
         self.token_manager = TokenManager()
-        self.progress_reporter = ProgressReporter()
+        self._progress_reporter = None
+    
+    @property
+    def progress_reporter(self):
+        """Progress reporter, created on first use to keep startup light."""
+        if self._progress_reporter is None:
+            from .progress import ProgressReporter
+            self._progress_reporter = ProgressReporter()
+        return self._progress_reporter
     
     def main(self, args: Optional[List[str]] = None) -> int:
         """
@@ -49,6 +153,14 @@ class QuipMirrorCLI:
         Returns:
             Exit code (0 for success, non-zero for failure)
         """
+        # Set up logging here rather than at import time; this is a no-op
+        # if the root logger has already been configured
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            stream=sys.stderr
+        )
+        
         try:
             # Parse command line arguments
             config = self.parse_arguments(args)
@@ -65,7 +177,7 @@ class QuipMirrorCLI:
             result = self.execute_mirror(config)
             
             # Return appropriate exit code
-            return 0 if result.successful_conversions > 0 or result.total_documents == 0 else 1
+            return 0 if result.successful_conversions > 0 or result.skipped_documents > 0 or result.total_documents == 0 else 1
             
         except KeyboardInterrupt:
             print("\n\nOperation cancelled by user.")
@@ -88,111 +200,36 @@ class QuipMirrorCLI:
         Returns:
             MirrorConfig object with parsed arguments
         """
-        parser = argparse.ArgumentParser(
-            description="Mirror Quip folders to local filesystem with Word document export",
-            formatter_class=argparse.RawDescriptionHelpFormatter,
-            epilog="""
-Examples:
-  %(prog)s https://quip-amazon.com/folder/ABC123 ./local-mirror
-  %(prog)s --token YOUR_TOKEN https://quip-amazon.com/folder/ABC123 ./docs
-  
-Authentication:
-  The tool looks for your Quip access token in this order:
-  1. --token command line argument
-  2. QUIP_ACCESS_TOKEN environment variable  
-  3. ~/.quip_token configuration file
-  4. Interactive prompt
-  
-  Get your token at: https://quip-amazon.com/dev/token
-            """
-        )
-        
-        # Positional arguments
-        parser.add_argument(
-            "quip_folder_url",
-            help="URL of the Quip folder to mirror (must start with https://quip-amazon.com/)"
-        )
-        
-        parser.add_argument(
-            "target_path",
-            help="Local directory where the mirrored structure will be created"
-        )
-        
-        # Optional arguments
-        parser.add_argument(
-            "--token",
-            help="Quip personal access token (overrides environment and config file)"
-        )
-        
-        parser.add_argument(
-            "--overwrite",
-            action="store_true",
-            default=True,
-            help="Overwrite existing files (default: True)"
-        )
-        
-        parser.add_argument(
-            "--no-overwrite",
-            action="store_false",
-            dest="overwrite",
-            help="Do not overwrite existing files"
-        )
-        
-        parser.add_argument(
-            "--verbose", "-v",
-            action="store_true",
-            help="Enable verbose output"
-        )
-        
-        parser.add_argument(
-            "--quiet", "-q",
-            action="store_true",
-            help="Suppress progress output"
-        )
-        
-        parser.add_argument(
-            "--dry-run",
-            action="store_true",
-            help="Show what would be done without actually doing it"
-        )
-        
-        parser.add_argument(
-            "--max-depth",
-            type=int,
-            default=50,
-            help="Maximum folder traversal depth (default: 50)"
-        )
-        
-        parser.add_argument(
-            "--timeout",
-            type=int,
-            default=30,
-            help="API request timeout in seconds (default: 30)"
-        )
-        
-        parser.add_argument(
-            "--version",
-            action="version",
-            version="%(prog)s 0.1.0"
-        )
+        parser = _build_parser()
         
         # Parse arguments
         parsed_args = parser.parse_args(args)
         
         # Set up logging level based on verbosity
         if parsed_args.verbose:
-            logging.getLogger().setLevel(logging.DEBUG)
+            self._set_log_level(logging.DEBUG)
         elif parsed_args.quiet:
-            logging.getLogger().setLevel(logging.ERROR)
+            self._set_log_level(logging.ERROR)
         
         # Create and return config
         return MirrorConfig(
             quip_folder_url=parsed_args.quip_folder_url,
             target_path=parsed_args.target_path,
             access_token=parsed_args.token,  # Will be resolved later
-            overwrite_existing=parsed_args.overwrite
+            overwrite_existing=parsed_args.overwrite,
+            workers=parsed_args.workers,
+            use_folder_cache=parsed_args.use_folder_cache
         )
     
+    def _set_log_level(self, level: int) -> None:
+        """Apply a log level to the root logger and its handlers."""
+        root_logger = logging.getLogger()
+        root_logger.setLevel(level)
+        
+        # Keep handlers in step so filtered records are never formatted
+        for handler in root_logger.handlers:
+            handler.setLevel(level)
+    
     def get_access_token(self, config: MirrorConfig) -> str:
         """
         Discover and validate access token.
@@ -235,7 +272,7 @@ Authentication:
             config.validate()
             
             # Additional validation
-            target_path = Path(config.target_path)
+            target_path = config.target_path
             
             # Check if target path is writable
             if target_path.exists():
@@ -244,11 +281,7 @@ Authentication:
                     return False
                 
                 # Test write permissions
-                test_file = target_path / ".quip_mirror_test"
-                try:
-                    test_file.touch()
-                    test_file.unlink()
-                except OSError:
+                if not os.access(target_path, os.W_OK):
                     print(f"Error: No write permission to target directory: {config.target_path}")
                     return False
             else:
@@ -275,70 +308,99 @@ Authentication:
         Returns:
             ProcessingSummary with operation results
         """
+        # Heavy components are imported here so that --help/--version and
+        # argument errors never load the HTTP stack
+        from .quip_client import FolderCache, QuipAPIClient, QuipAPIError
+        from .traverser import FolderTraverser, TraversalError
+        from .filesystem import FileSystemManager, FileSystemError
+        from .converter import DocumentConverter
+        
         summary = ProcessingSummary()
+        progress_started = False
         
         try:
             # Initialize components
-            client = QuipAPIClient(config.access_token)
             filesystem_manager = FileSystemManager(config.target_path, config.overwrite_existing)
-            traverser = FolderTraverser(client)
-            converter = DocumentConverter(client, filesystem_manager)
+            
+            # Cached folder listings live next to the mirror; a broken cache only costs speed
+            folder_cache = None
+            if config.use_folder_cache:
+                try:
+                    folder_cache = FolderCache(os.path.join(config.target_path, FolderCache.FILENAME))
+                except Exception as e:
+                    logger.warning(f"Could not open folder cache: {str(e)}")
+            
+            client = QuipAPIClient(
+                config.access_token,
+                requests_per_minute=QuipAPIClient.DEFAULT_REQUESTS_PER_MINUTE,
+                pool_size=max(config.workers, 10),
+                folder_cache=folder_cache
+            )
+            traverser = FolderTraverser(client, max_workers=config.workers)
+            converter = DocumentConverter(
+                client,
+                filesystem_manager,
+                manifest=filesystem_manager.load_manifest(),
+                max_workers=config.workers
+            )
             
             # Extract folder ID from URL
             folder_id = client.extract_folder_id_from_url(config.quip_folder_url)
             logger.info(f"Starting mirror operation for folder: {folder_id}")
             
-            # Phase 1: Discover folder structure
-            print("Discovering folder structure...")
-            hierarchy = traverser.traverse(folder_id)
-            
-            summary.total_folders = hierarchy.total_folders
-            summary.total_documents = hierarchy.total_documents
-            
-            logger.info(f"Discovered {summary.total_folders} folders and {summary.total_documents} documents")
-            
-            if summary.total_documents == 0:
-                print("No documents found in the specified folder.")
-                return summary
+            # Discover folders and export their documents in one pipeline:
+            # exports start as soon as the first folder is listed, and each
+            # export creates its own directory
+            print("Discovering and exporting documents...")
             
-            # Phase 2: Create directory structure
-            print("Creating local directory structure...")
-            filesystem_manager.create_directory_structure(hierarchy)
+            # Set up progress reporting; the total grows as folders are listed
+            self.progress_reporter.start_progress(0, "Exporting Documents")
+            progress_started = True
             
-            # Phase 3: Get all documents with path information
-            documents = traverser.build_document_list(hierarchy)
+            # Create progress callback
+            def progress_callback(current: int, total: int, item_name: str):
+                self.progress_reporter.update_progress(item_name, current, total)
             
-            # Update document paths
-            for doc_info in documents:
-                doc_info.local_file_path = filesystem_manager.get_document_path(doc_info)
+            # Leaving the block releases the worker threads
+            try:
+                with converter:
+                    export_results = converter.stream_export(traverser.iter_documents(folder_id), progress_callback)
+            finally:
+                if folder_cache is not None:
+                    logger.info(f"Folder cache: {folder_cache.hits} unchanged, {folder_cache.misses} refetched")
+                    folder_cache.close()
             
-            # Phase 4: Export documents
-            print(f"Exporting {len(documents)} documents...")
+            summary.total_folders = traverser.folders_visited
+            summary.total_documents = export_results["total"]
             
-            # Set up progress reporting
-            self.progress_reporter.start_progress(len(documents), "Exporting Documents")
+            logger.info(f"Discovered {summary.total_folders} folders and {summary.total_documents} documents")
             
-            # Create progress callback
-            def progress_callback(current: int, total: int, item_name: str):
-                self.progress_reporter.update_progress(item_name, current)
+            # Subfolders that could not be listed were skipped; report them
+            for failed_id, failed_name, error in traverser.failed_folders:
+                summary.add_error(f"Folder {failed_name} ({failed_id}): {str(error)}")
             
-            # Export documents in batch
-            export_results = converter.batch_export(documents, progress_callback)
+            if summary.total_documents == 0:
+                print("No documents found in the specified folder.")
+                return summary
             
             # Update summary with results
             summary.successful_conversions = len(export_results["successful"])
             summary.failed_conversions = len(export_results["failed"])
+            summary.skipped_documents = len(export_results["skipped"])
             
             # Add errors to summary
             for failed_item in export_results["failed"]:
                 summary.add_error(f"{failed_item['document']}: {failed_item['error']}")
             
-            # Finish progress reporting
-            self.progress_reporter.finish_progress(summary)
+            # Record exported versions so unchanged documents are skipped next run
+            try:
+                filesystem_manager.save_manifest(converter.manifest)
+            except FileSystemError as e:
+                logger.warning(f"Could not save export manifest: {str(e)}")
             
             # Display additional information
             if export_results["skipped"]:
-                print(f"\nSkipped {len(export_results['skipped'])} documents (already exist, overwrite disabled)")
+                print(f"\nSkipped {len(export_results['skipped'])} documents (unchanged or already exist)")
             
             # Clean up empty directories
             removed_dirs = filesystem_manager.cleanup_empty_directories()
@@ -374,6 +436,11 @@ Authentication:
             summary.add_error(error_msg)
             print(f"\nError: {error_msg}")
             return summary
+            
+        finally:
+            # Finish progress reporting on every path once it has started
+            if progress_started:
+                self.progress_reporter.finish_progress(summary)
 
 
 def main():
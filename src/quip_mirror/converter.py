@@ -5,18 +5,27 @@ This module provides the DocumentConverter class that handles the conversion
 of Quip documents to DOCX format using the Quip API's direct export functionality.
 """
 
+import os
+import time
+import random
 import logging
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Tuple
-import time
+from typing import Dict, Iterable, Optional, Tuple
 
-from .models import DocumentInfo, DocumentContent
-from .quip_client import QuipAPIClient, QuipAPIError
+from .models import ConversionStats, DocumentInfo, DocumentContent
+from .quip_client import QuipAPIClient, QuipAPIError, RateLimiter
 from .filesystem import FileSystemManager, FileSystemError
 
 
 logger = logging.getLogger(__name__)
 
+# Signatures used for the quick DOCX (ZIP) validity check
+ZIP_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+ZIP_EOCD_SIGNATURE = b"PK\x05\x06"
+
 
 class ConversionError(Exception):
     """Exception raised during document conversion."""
@@ -26,21 +35,81 @@ class ConversionError(Exception):
 class DocumentConverter:
     """Handles conversion of Quip documents to Word format."""
     
-    def __init__(self, client: QuipAPIClient, filesystem_manager: FileSystemManager):
+    # Retry policy for transient export failures (rate limiting, gateway errors, timeouts)
+    EXPORT_ATTEMPTS = 3
+    RETRY_BASE_WAIT = 1.0
+    RETRY_MAX_WAIT = 4.0
+    RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+    RETRYABLE_MARKERS = ("429", "rate limit", "quota", "timeout", "502", "503", "504")
+    
+    # Minimum seconds between progress callbacks during batch export
+    PROGRESS_INTERVAL = 0.1
+    
+    # Exports without metadata are recorded as current as of their start time,
+    # backdated to absorb clock skew against Quip (at worst causing a re-export)
+    MANIFEST_CLOCK_MARGIN_USEC = 5 * 60 * 1000000
+    
+    def __init__(self, client: QuipAPIClient, filesystem_manager: FileSystemManager,
+                 manifest: Optional[Dict[str, int]] = None, max_workers: Optional[int] = None,
+                 rate: Optional[float] = None):
         """
         Initialize the document converter.
         
         Args:
             client: QuipAPIClient for API operations
             filesystem_manager: FileSystemManager for file operations
+            manifest: Optional mapping of thread IDs to the Quip ``updated_usec``
+                time their exported copy is current as of; when given, documents
+                not updated since are skipped and the mapping is updated as
+                documents are exported. Only documents with an entry cost a
+                metadata request.
+            max_workers: Default number of concurrent exports for batch_export
+                (defaults to min(8, 4 * CPU count))
+            rate: Optional cap on document exports per second, shared by all
+                worker threads
         """
         self.client = client
         self.filesystem_manager = filesystem_manager
-        self.conversion_stats = {
-            "successful": 0,
-            "failed": 0,
-            "skipped": 0
-        }
+        self.max_workers = max_workers if max_workers is not None else min(8, (os.cpu_count() or 1) * 4)
+        self.rate_limiter = RateLimiter(rate, period=1.0) if rate else None
+        self.manifest = manifest
+        self.conversion_stats = ConversionStats()
+        self._stats_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        
+        # Output path -> thread ID, so same-named documents get distinct files
+        self._claimed_paths: Dict[str, str] = {}
+        self._paths_lock = threading.Lock()
+    
+    def __enter__(self) -> "DocumentConverter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the converter's shared thread pool, creating it on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="quip-export"
+                )
+            return self._executor
+    
+    def close(self) -> None:
+        """Shut down the shared thread pool, waiting for running exports to finish."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        
+        if executor is not None:
+            executor.shutdown(wait=True)
+    
+    def _increment_stat(self, key: str) -> None:
+        """Increment a conversion statistic; safe to call from worker threads."""
+        with self._stats_lock:
+            setattr(self.conversion_stats, key, getattr(self.conversion_stats, key) + 1)
     
     def export_to_word(self, doc_info: DocumentInfo, output_path: Optional[str] = None) -> Tuple[bool, str]:
         """
@@ -59,76 +128,267 @@ class DocumentConverter:
                 output_path = self.filesystem_manager.get_document_path(doc_info)
             else:
                 output_path = doc_info.local_file_path
+            
+            output_path = self._claim_output_path(output_path, doc_info.item.id)
+            doc_info.local_file_path = output_path
+        else:
+            output_path = self._claim_output_path(output_path, doc_info.item.id)
+        
+        temp_path = None
         
         try:
             # Ensure output directory exists
             output_dir = Path(output_path).parent
             self.filesystem_manager.ensure_directory_exists(str(output_dir))
             
+            logger.debug("Converting document: %s (%s)", doc_info.item.name, doc_info.item.id)
+            
+            # Only documents exported before and still on disk can be skipped,
+            # so only they need a metadata round trip
+            doc_metadata = None
+            if self._was_exported(doc_info, output_path):
+                doc_metadata = self._get_metadata(doc_info.item.id)
+                
+                # Skip documents that haven't changed since the last export
+                if self._is_unchanged(doc_info, doc_metadata):
+                    self._increment_stat("skipped")
+                    return False, f"Skipped unchanged document '{doc_info.item.name}'"
+            
             # Handle file conflicts
             should_proceed, conflict_message = self.filesystem_manager.handle_file_conflict(output_path)
             if not should_proceed:
-                self.conversion_stats["skipped"] += 1
+                self._increment_stat("skipped")
                 return False, conflict_message
             
-            # Get document metadata first (for better error messages)
-            try:
-                doc_metadata = self.client.get_document_metadata(doc_info.item.id)
-                logger.debug(f"Converting document: {doc_metadata.title} ({doc_info.item.id})")
-            except QuipAPIError as e:
-                logger.warning(f"Could not get metadata for document {doc_info.item.id}: {str(e)}")
-                doc_metadata = None
-            
-            # Export document to DOCX
-            success = self.client.export_document_to_docx(doc_info.item.id, output_path)
+            # Export document to DOCX via a temporary sibling so an existing
+            # file is only replaced once the new one is complete
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            export_started_usec = time.time_ns() // 1000
+            temp_path = self.filesystem_manager.create_temp_file(output_path)
+            success = self._export_with_retry(doc_info.item.id, temp_path)
             
             if success:
-                # Verify the file was created and has content
-                if self.filesystem_manager.file_exists(output_path):
-                    file_size = self.filesystem_manager.get_file_size(output_path)
-                    if file_size > 0:
-                        self.conversion_stats["successful"] += 1
-                        doc_name = doc_metadata.title if doc_metadata else doc_info.item.name
-                        return True, f"Successfully exported '{doc_name}' ({file_size} bytes)"
-                    else:
-                        self.conversion_stats["failed"] += 1
-                        return False, f"Exported file is empty: {output_path}"
-                else:
-                    self.conversion_stats["failed"] += 1
+                # Verify the file was created and has content (one stat for both checks)
+                file_stat = self.filesystem_manager.stat_or_none(temp_path)
+                if file_stat is None:
+                    self._increment_stat("failed")
                     return False, f"Export appeared successful but file was not created: {output_path}"
+                elif file_stat.st_size == 0:
+                    self._increment_stat("failed")
+                    return False, f"Exported file is empty: {output_path}"
+                else:
+                    file_size = file_stat.st_size
+                    self.filesystem_manager.replace_file(temp_path, output_path)
+                    self._increment_stat("successful")
+                    if self.manifest is not None:
+                        if doc_metadata is not None and doc_metadata.updated_usec is not None:
+                            self.manifest[doc_info.item.id] = doc_metadata.updated_usec
+                        else:
+                            self.manifest[doc_info.item.id] = export_started_usec - self.MANIFEST_CLOCK_MARGIN_USEC
+                    return True, f"Successfully exported '{doc_info.item.name}' ({file_size} bytes)"
             else:
-                self.conversion_stats["failed"] += 1
+                self._increment_stat("failed")
                 return False, f"Export failed for document {doc_info.item.id}"
                 
         except QuipAPIError as e:
-            self.conversion_stats["failed"] += 1
+            self._increment_stat("failed")
             error_msg = f"API error exporting document {doc_info.item.id}: {str(e)}"
             logger.error(error_msg)
             return False, error_msg
             
         except FileSystemError as e:
-            self.conversion_stats["failed"] += 1
+            self._increment_stat("failed")
             error_msg = f"File system error exporting document {doc_info.item.id}: {str(e)}"
             logger.error(error_msg)
             return False, error_msg
             
         except Exception as e:
-            self.conversion_stats["failed"] += 1
+            self._increment_stat("failed")
             error_msg = f"Unexpected error exporting document {doc_info.item.id}: {str(e)}"
             logger.error(error_msg)
             return False, error_msg
+        
+        finally:
+            # Never leave a partial download behind
+            if temp_path is not None:
+                self.filesystem_manager.remove_file(temp_path)
     
-    def batch_export(self, documents: list[DocumentInfo], progress_callback=None) -> dict:
+    def _claim_output_path(self, output_path: str, thread_id: str) -> str:
+        """
+        Reserve an output path for a document for the rest of this converter's life.
+        
+        Documents with the same title in the same folder map to the same
+        path; later ones get a numbered suffix so concurrent exports never
+        overwrite each other. A document always gets back the path it
+        claimed first.
+        
+        Args:
+            output_path: Preferred output path
+            thread_id: Quip document/thread ID claiming the path
+            
+        Returns:
+            The path reserved for this document
+        """
+        root, ext = os.path.splitext(output_path)
+        candidate = output_path
+        suffix = 1
+        
+        with self._paths_lock:
+            while self._claimed_paths.setdefault(candidate, thread_id) != thread_id:
+                suffix += 1
+                candidate = f"{root}-{suffix}{ext}"
+        
+        return candidate
+    
+    def _assign_output_path(self, doc_info: DocumentInfo) -> None:
+        """
+        Claim a document's output path before it is handed to a worker.
+        
+        Claiming on the submitting thread, in listing order, makes the
+        numbered suffixes of same-named documents independent of which
+        export happens to start first, so reruns map each document to the
+        same file.
+        
+        Args:
+            doc_info: DocumentInfo to update in place
+        """
+        output_path = doc_info.local_file_path or self.filesystem_manager.get_document_path(doc_info)
+        doc_info.local_file_path = self._claim_output_path(output_path, doc_info.item.id)
+    
+    def _get_metadata(self, thread_id: str) -> Optional[DocumentContent]:
+        """
+        Get document metadata, logging instead of raising on failure.
+        
+        Args:
+            thread_id: Quip document/thread ID
+            
+        Returns:
+            DocumentContent with metadata, or None if it could not be fetched
+        """
+        try:
+            return self.client.get_document_metadata(thread_id)
+        except QuipAPIError as e:
+            logger.warning(f"Could not get metadata for document {thread_id}: {str(e)}")
+            return None
+    
+    def _export_with_retry(self, thread_id: str, output_path: str) -> bool:
+        """
+        Export a document, retrying transient API errors with exponential backoff.
+        
+        Args:
+            thread_id: Quip document/thread ID
+            output_path: Local file path to save the DOCX file
+            
+        Returns:
+            True if export was successful, False otherwise
+            
+        Raises:
+            QuipAPIError: If the error is not transient or all attempts fail
+        """
+        for attempt in range(self.EXPORT_ATTEMPTS):
+            try:
+                return self.client.export_document_to_docx(thread_id, output_path)
+            except QuipAPIError as e:
+                if attempt == self.EXPORT_ATTEMPTS - 1 or not self._is_retryable(e):
+                    raise
+                
+                wait_time = min(self.RETRY_MAX_WAIT, self.RETRY_BASE_WAIT * 2 ** attempt) + random.uniform(0, 0.25)
+                logger.warning(f"Transient error exporting document {thread_id} "
+                               f"(attempt {attempt + 1}/{self.EXPORT_ATTEMPTS}), retrying in {wait_time:.1f}s: {str(e)}")
+                time.sleep(wait_time)
+        
+        return False
+    
+    def _is_retryable(self, error: QuipAPIError) -> bool:
+        """Check whether an API error is likely transient and worth retrying."""
+        if error.status_code is not None:
+            return error.status_code in self.RETRYABLE_STATUS_CODES
+        
+        message = str(error).lower()
+        return any(marker in message for marker in self.RETRYABLE_MARKERS)
+    
+    def _was_exported(self, doc_info: DocumentInfo, output_path: str) -> bool:
+        """Check whether a document has a manifest entry and is still on disk."""
+        if self.manifest is None or doc_info.item.id not in self.manifest:
+            return False
+        
+        return self.filesystem_manager.file_exists(output_path)
+    
+    def _is_unchanged(self, doc_info: DocumentInfo, doc_metadata: Optional[DocumentContent]) -> bool:
+        """Check whether a document was last updated before its recorded export."""
+        if self.manifest is None or doc_metadata is None or doc_metadata.updated_usec is None:
+            return False
+        
+        return doc_metadata.updated_usec <= self.manifest.get(doc_info.item.id, -1)
+    
+    def export_one(self, doc_info: DocumentInfo) -> Tuple[str, dict]:
+        """
+        Export a single document and classify the outcome for batch reporting.
+        
+        Args:
+            doc_info: DocumentInfo object to export
+            
+        Returns:
+            Tuple of (category, entry) where category is "successful",
+            "failed" or "skipped" and entry describes the document
+        """
+        try:
+            success, message = self.export_to_word(doc_info)
+        except Exception as e:
+            error_msg = f"Unexpected error processing document {doc_info.item.name}: {str(e)}"
+            logger.error(error_msg)
+            return "failed", {
+                "document": doc_info.item.name,
+                "id": doc_info.item.id,
+                "error": error_msg
+            }
+        
+        if success:
+            return "successful", {
+                "document": doc_info.item.name,
+                "id": doc_info.item.id,
+                "path": doc_info.local_file_path or "auto-generated",
+                "message": message
+            }
+        elif "skipped" in message.lower():
+            return "skipped", {
+                "document": doc_info.item.name,
+                "id": doc_info.item.id,
+                "reason": message
+            }
+        else:
+            return "failed", {
+                "document": doc_info.item.name,
+                "id": doc_info.item.id,
+                "error": message
+            }
+    
+    def batch_export(self, documents: list[DocumentInfo], progress_callback=None,
+                     max_workers: Optional[int] = None) -> dict:
         """
         Export multiple documents in batch.
         
+        Exports are independent, so with max_workers > 1 they are issued
+        concurrently from a thread pool. Pacing comes from the rate limiters
+        on the converter and client rather than fixed delays. The converter's
+        shared pool is reused across batches; call close() (or use the
+        converter as a context manager) to release its threads. Progress
+        callbacks are throttled to one per PROGRESS_INTERVAL seconds, and
+        the final item is always reported.
+        
         Args:
             documents: List of DocumentInfo objects to export
             progress_callback: Optional callback function for progress updates
+            max_workers: Number of documents to export concurrently
+                (defaults to the converter's max_workers)
             
         Returns:
             Dictionary with batch export results
         """
+        if max_workers is None:
+            max_workers = self.max_workers
+        
         results = {
             "successful": [],
             "failed": [],
@@ -138,47 +398,129 @@ class DocumentConverter:
         
         logger.info(f"Starting batch export of {len(documents)} documents")
         
-        for i, doc_info in enumerate(documents):
-            try:
+        total = len(documents)
+        last_callback = 0.0
+        
+        def report_progress(current: int, item_name: str) -> None:
+            nonlocal last_callback
+            now = time.monotonic()
+            if current == total or now - last_callback >= self.PROGRESS_INTERVAL:
+                last_callback = now
+                progress_callback(current, total, item_name)
+        
+        for doc_info in documents:
+            self._assign_output_path(doc_info)
+        
+        if max_workers <= 1:
+            for i, doc_info in enumerate(documents):
                 # Call progress callback if provided
                 if progress_callback:
-                    progress_callback(i + 1, len(documents), doc_info.item.name)
+                    report_progress(i + 1, doc_info.item.name)
                 
-                success, message = self.export_to_word(doc_info)
+                category, entry = self.export_one(doc_info)
+                results[category].append(entry)
+        else:
+            # A one-off pool is only needed when the caller overrides the worker count
+            if max_workers == self.max_workers:
+                executor, owns_executor = self._get_executor(), False
+            else:
+                executor, owns_executor = ThreadPoolExecutor(max_workers=max_workers), True
+            
+            try:
+                futures = {executor.submit(self.export_one, doc_info): doc_info for doc_info in documents}
                 
-                if success:
-                    results["successful"].append({
-                        "document": doc_info.item.name,
-                        "id": doc_info.item.id,
-                        "path": doc_info.local_file_path or "auto-generated",
-                        "message": message
-                    })
-                elif "skipped" in message.lower():
-                    results["skipped"].append({
-                        "document": doc_info.item.name,
-                        "id": doc_info.item.id,
-                        "reason": message
-                    })
-                else:
-                    results["failed"].append({
-                        "document": doc_info.item.name,
-                        "id": doc_info.item.id,
-                        "error": message
-                    })
+                for completed, future in enumerate(as_completed(futures), 1):
+                    category, entry = future.result()
+                    results[category].append(entry)
+                    
+                    if progress_callback:
+                        report_progress(completed, futures[future].item.name)
+            finally:
+                if owns_executor:
+                    executor.shutdown(wait=True)
+        
+        logger.info(f"Batch export completed: {len(results['successful'])} successful, "
+                   f"{len(results['failed'])} failed, {len(results['skipped'])} skipped")
+        
+        return results
+    
+    def stream_export(self, documents: Iterable[DocumentInfo], progress_callback=None) -> dict:
+        """
+        Export documents as they are produced, e.g. by FolderTraverser.iter_documents().
+        
+        Each document is submitted to the converter's shared pool as soon as
+        it is yielded, so exports of early folders run while later folders
+        are still being listed. Documents without a local_file_path get one
+        from the filesystem manager; output paths are claimed in the order
+        documents are yielded. Progress callbacks are throttled like
+        batch_export's; their total is the number of documents seen so far.
+        
+        Args:
+            documents: Iterable of DocumentInfo objects to export
+            progress_callback: Optional callback function for progress updates
+            
+        Returns:
+            Dictionary with batch export results
+            
+        Raises:
+            Any exception raised while iterating documents; exports already
+            submitted are allowed to finish first
+        """
+        results = {
+            "successful": [],
+            "failed": [],
+            "skipped": [],
+            "total": 0
+        }
+        
+        executor = self._get_executor()
+        finished: "queue.Queue[Tuple[Future, str]]" = queue.Queue()
+        submitted = 0
+        completed = 0
+        last_callback = 0.0
+        last_item = ""
+        reported = 0
+        
+        def collect(block: bool) -> None:
+            nonlocal completed, last_callback, last_item, reported
+            while completed < submitted:
+                try:
+                    future, last_item = finished.get(block=block)
+                except queue.Empty:
+                    return
                 
-                # Small delay to avoid overwhelming the API
-                time.sleep(0.1)
+                category, entry = future.result()
+                results[category].append(entry)
+                completed += 1
                 
-            except Exception as e:
-                error_msg = f"Unexpected error processing document {doc_info.item.name}: {str(e)}"
-                logger.error(error_msg)
-                results["failed"].append({
-                    "document": doc_info.item.name,
-                    "id": doc_info.item.id,
-                    "error": error_msg
-                })
+                if progress_callback:
+                    now = time.monotonic()
+                    if now - last_callback >= self.PROGRESS_INTERVAL:
+                        last_callback = now
+                        reported = completed
+                        progress_callback(completed, submitted, last_item)
         
-        logger.info(f"Batch export completed: {len(results['successful'])} successful, "
+        logger.info("Starting streaming export")
+        
+        try:
+            for doc_info in documents:
+                self._assign_output_path(doc_info)
+                
+                future = executor.submit(self.export_one, doc_info)
+                future.add_done_callback(lambda f, name=doc_info.item.name: finished.put((f, name)))
+                submitted += 1
+                
+                # Report exports that finished while we waited on the next document
+                collect(block=False)
+        finally:
+            collect(block=True)
+            results["total"] = submitted
+            
+            # Always report the final item
+            if progress_callback and reported != completed:
+                progress_callback(completed, submitted, last_item)
+        
+        logger.info(f"Streaming export completed: {len(results['successful'])} successful, "
                    f"{len(results['failed'])} failed, {len(results['skipped'])} skipped")
         
         return results
@@ -217,38 +559,31 @@ class DocumentConverter:
         else:
             return self.filesystem_manager.handle_file_conflict(file_path)
     
-    def get_conversion_stats(self) -> dict:
+    def get_conversion_stats(self) -> ConversionStats:
         """
         Get conversion statistics.
         
+        The live counters are returned without copying, so this is cheap to
+        poll; use dataclasses.asdict() for a snapshot.
+        
         Returns:
-            Dictionary with conversion statistics
+            ConversionStats with counts, total and success rate
         """
-        total = sum(self.conversion_stats.values())
-        stats = self.conversion_stats.copy()
-        stats["total"] = total
-        
-        if total > 0:
-            stats["success_rate"] = (stats["successful"] / total) * 100
-        else:
-            stats["success_rate"] = 0.0
-        
-        return stats
+        return self.conversion_stats
     
     def reset_stats(self) -> None:
         """Reset conversion statistics."""
-        self.conversion_stats = {
-            "successful": 0,
-            "failed": 0,
-            "skipped": 0
-        }
+        with self._stats_lock:
+            self.conversion_stats = ConversionStats()
     
-    def validate_document_export(self, file_path: str) -> Tuple[bool, str]:
+    def validate_document_export(self, file_path: str, quick: bool = True) -> Tuple[bool, str]:
         """
         Validate that an exported document is valid.
         
         Args:
             file_path: Path to the exported DOCX file
+            quick: Only check the ZIP signatures at the start and end of the
+                file instead of parsing the central directory
             
         Returns:
             Tuple of (is_valid, message)
@@ -261,6 +596,11 @@ class DocumentConverter:
             if file_size == 0:
                 return False, "File is empty"
             
+            if quick:
+                if self._has_zip_signatures(file_path, file_size):
+                    return True, f"Valid DOCX file ({file_size} bytes)"
+                return False, "File is not a valid ZIP/DOCX file"
+            
             # Basic validation - check if it's a valid ZIP file (DOCX is ZIP-based)
             try:
                 import zipfile
@@ -279,6 +619,17 @@ class DocumentConverter:
         except Exception as e:
             return False, f"Validation error: {str(e)}"
     
+    def _has_zip_signatures(self, file_path: str, file_size: int) -> bool:
+        """Check for a local file header at the start and an end-of-central-directory record at the end."""
+        with open(file_path, 'rb') as f:
+            if f.read(4) != ZIP_LOCAL_HEADER_SIGNATURE:
+                return False
+            
+            # The EOCD record is 22 bytes plus an optional comment of up to 64 KiB
+            tail_size = min(file_size, 22 + 0xFFFF)
+            f.seek(-tail_size, os.SEEK_END)
+            return f.read(tail_size).rfind(ZIP_EOCD_SIGNATURE) != -1
+    
     def estimate_conversion_time(self, document_count: int) -> float:
         """
         Estimate total conversion time based on document count.
@@ -6,9 +6,15 @@ local directory structures and managing file operations.
 """
 
 import os
+import re
+import json
+import time
+import uuid
 import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import shutil
 
 from .models import FolderHierarchy, DocumentInfo, QuipItem
@@ -16,6 +22,33 @@ from .models import FolderHierarchy, DocumentInfo, QuipItem
 
 logger = logging.getLogger(__name__)
 
+# Invalid filename characters and spaces become dashes; control characters are dropped
+_SANITIZE_TABLE = str.maketrans({
+    **{char: '-' for char in '<>:"/\\|?* '},
+    **{code: None for code in range(32)},
+})
+_DASH_RUN_RE = re.compile(r'-{2,}')
+
+
+@functools.lru_cache(maxsize=8192)
+def _sanitize(name: str) -> str:
+    """Sanitize a file or folder name; pure, so results are cached per name."""
+    # Replace invalid characters and spaces, drop control characters
+    sanitized = name.translate(_SANITIZE_TABLE)
+    
+    # Collapse runs of dashes and strip leading/trailing dashes and whitespace
+    sanitized = _DASH_RUN_RE.sub('-', sanitized).strip('- ')
+    
+    # Ensure it's not empty
+    if not sanitized:
+        sanitized = "untitled"
+    
+    # Limit length to avoid file system issues
+    if len(sanitized) > 200:
+        sanitized = sanitized[:200].rstrip('- ')
+    
+    return sanitized
+
 
 class FileSystemError(Exception):
     """Exception raised for file system operations."""
@@ -25,16 +58,25 @@ class FileSystemError(Exception):
 class FileSystemManager:
     """Manages local file system operations for mirroring Quip folders."""
     
-    def __init__(self, base_path: str, overwrite_existing: bool = True):
+    MANIFEST_FILENAME = ".quip_mirror_manifest.json"
+    DIRECTORY_WORKERS = 16
+    
+    def __init__(self, base_path: Union[str, Path], overwrite_existing: bool = True,
+                 backup_on_overwrite: bool = False):
         """
         Initialize the file system manager.
         
         Args:
             base_path: Base directory path for mirroring
             overwrite_existing: Whether to overwrite existing files
+            backup_on_overwrite: Whether to copy existing files aside before overwriting
         """
         self.base_path = Path(base_path)
         self.overwrite_existing = overwrite_existing
+        self.backup_on_overwrite = backup_on_overwrite
+        
+        # Sanitized directory components keyed by Quip relative path
+        self._path_cache: Dict[str, Tuple[str, ...]] = {}
         
         # Ensure base path exists
         self.base_path.mkdir(parents=True, exist_ok=True)
@@ -59,18 +101,16 @@ class FileSystemManager:
             current_path = self.base_path
         
         try:
-            # Create directory for this folder
-            folder_name = self.sanitize_folder_name(hierarchy.root_folder.name)
-            folder_path = current_path / folder_name
-            
-            logger.debug(f"Creating directory: {folder_path}")
-            folder_path.mkdir(parents=True, exist_ok=True)
+            # Resolve every directory up front, then create them concurrently;
+            # mkdir releases the GIL, which helps on high-latency file systems
+            directories: List[Path] = []
+            self._collect_directories(hierarchy, current_path, directories)
             
-            # Recursively create subdirectories
-            for subfolder_hierarchy in hierarchy.subfolders.values():
-                self.create_directory_structure(subfolder_hierarchy, folder_path)
+            with ThreadPoolExecutor(max_workers=self.DIRECTORY_WORKERS) as executor:
+                # Consume the iterator so any mkdir error is raised here
+                list(executor.map(self._make_directory, directories))
             
-            logger.debug(f"Successfully created directory structure for: {folder_name}")
+            logger.debug(f"Successfully created directory structure for: {hierarchy.root_folder.name}")
             return True
             
         except OSError as e:
@@ -78,6 +118,23 @@ class FileSystemManager:
         except Exception as e:
             raise FileSystemError(f"Unexpected error creating directories: {str(e)}") from e
     
+    def _collect_directories(self, hierarchy: FolderHierarchy, current_path: Path, directories: List[Path]) -> None:
+        """Append the local directory for each folder in the hierarchy, parents first."""
+        # Iterative traversal so deep hierarchies can't hit the recursion limit
+        pending = [(hierarchy, current_path)]
+        while pending:
+            node, parent_path = pending.pop()
+            folder_path = parent_path / self.sanitize_folder_name(node.root_folder.name)
+            directories.append(folder_path)
+            
+            for subfolder_hierarchy in node.subfolders.values():
+                pending.append((subfolder_hierarchy, folder_path))
+    
+    def _make_directory(self, path: Path) -> None:
+        """Create a directory and any missing parents."""
+        logger.debug("Creating directory: %s", path)
+        path.mkdir(parents=True, exist_ok=True)
+    
     def ensure_directory_exists(self, path: str) -> bool:
         """
         Ensure a directory exists, creating it if necessary.
@@ -94,7 +151,7 @@ class FileSystemManager:
         try:
             dir_path = Path(path)
             dir_path.mkdir(parents=True, exist_ok=True)
-            logger.debug(f"Ensured directory exists: {dir_path}")
+            logger.debug("Ensured directory exists: %s", dir_path)
             return True
             
         except OSError as e:
@@ -114,31 +171,143 @@ class FileSystemManager:
         if base_path is None:
             base_path = str(self.base_path)
         
-        # Sanitize the relative path components
-        path_parts = doc_info.relative_path.split('/')
-        sanitized_parts = [self.sanitize_folder_name(part) for part in path_parts if part]
-        
-        # Create the directory path
-        dir_path = Path(base_path)
-        for part in sanitized_parts:
-            dir_path = dir_path / part
-        
-        # Create the file path with sanitized filename
-        filename = self.sanitize_filename(doc_info.item.name)
+        dir_path = self._get_directory_path(base_path, doc_info.relative_path)
+        return os.path.join(dir_path, self._get_document_filename(doc_info.item.name))
+    
+    def _get_directory_path(self, base_path: str, relative_path: str) -> str:
+        """Resolve a '/'-separated Quip folder path to a sanitized local directory."""
+        # Many documents share a folder, so sanitize each relative path only once
+        sanitized_parts = self._path_cache.get(relative_path)
+        if sanitized_parts is None:
+            sanitized_parts = tuple(self.sanitize_folder_name(part) for part in relative_path.split('/') if part)
+            self._path_cache[relative_path] = sanitized_parts
+        
+        return os.path.join(base_path, *sanitized_parts)
+    
+    def _get_document_filename(self, name: str) -> str:
+        """Get the sanitized .docx filename for a document name."""
+        filename = self.sanitize_filename(name)
         if not filename.endswith('.docx'):
             filename += '.docx'
+        return filename
+    
+    def load_manifest(self) -> Dict[str, int]:
+        """
+        Load the export manifest from the base directory.
+        
+        The manifest maps Quip thread IDs to the Quip ``updated_usec`` time
+        the exported copy of the document is current as of.
+        
+        Returns:
+            Manifest dictionary, empty if missing or unreadable
+        """
+        manifest_path = self.base_path / self.MANIFEST_FILENAME
+        
+        try:
+            data = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable manifest {manifest_path}: {str(e)}")
+            return {}
+        
+        if not isinstance(data, dict):
+            logger.warning(f"Ignoring malformed manifest {manifest_path}")
+            return {}
+        
+        logger.debug(f"Loaded manifest with {len(data)} entries from {manifest_path}")
+        return data
+    
+    def save_manifest(self, manifest: Dict[str, int]) -> None:
+        """
+        Atomically write the export manifest to the base directory.
+        
+        Args:
+            manifest: Mapping of thread IDs to the ``updated_usec`` time each exported copy is current as of
+            
+        Raises:
+            FileSystemError: If the manifest cannot be written
+        """
+        manifest_path = self.base_path / self.MANIFEST_FILENAME
+        tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+        
+        try:
+            tmp_path.write_text(json.dumps(manifest, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, manifest_path)
+            logger.debug(f"Saved manifest with {len(manifest)} entries to {manifest_path}")
+        except OSError as e:
+            raise FileSystemError(f"Cannot write manifest {manifest_path}: {str(e)}") from e
+    
+    def replace_file(self, source_path: str, target_path: str) -> None:
+        """
+        Atomically move a file into place, replacing any existing file.
+        
+        Args:
+            source_path: Path of the completed file
+            target_path: Final path for the file
+            
+        Raises:
+            FileSystemError: If the file cannot be moved
+        """
+        try:
+            os.replace(source_path, target_path)
+        except OSError as e:
+            raise FileSystemError(f"Cannot move {source_path} to {target_path}: {str(e)}") from e
+    
+    def create_temp_file(self, target_path: str) -> str:
+        """
+        Create an empty, uniquely named temporary file next to a target path.
         
-        file_path = dir_path / filename
-        return str(file_path)
+        The file lives in the target's directory so it can later be moved
+        into place atomically with replace_file(). It is created with the
+        same umask-derived permissions as a regular file, so the moved file
+        keeps the permissions a direct write would have given it.
+        
+        Args:
+            target_path: Final path the temporary file is meant to replace
+            
+        Returns:
+            Path of the new temporary file
+            
+        Raises:
+            FileSystemError: If the file cannot be created
+        """
+        directory, name = os.path.split(target_path)
+        
+        while True:
+            temp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:12]}.tmp")
+            try:
+                fd = os.open(temp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+            except FileExistsError:
+                continue
+            except OSError as e:
+                raise FileSystemError(f"Cannot create temporary file for {target_path}: {str(e)}") from e
+            
+            os.close(fd)
+            return temp_path
+    
+    def remove_file(self, path: str) -> None:
+        """Remove a file if it exists, ignoring errors."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
     
     def file_exists(self, path: str) -> bool:
         """Check if a file exists."""
-        return Path(path).exists()
+        return os.path.exists(path)
+    
+    def stat_or_none(self, path: str) -> Optional[os.stat_result]:
+        """Stat a file, returning None if it doesn't exist."""
+        try:
+            return os.stat(path)
+        except FileNotFoundError:
+            return None
     
     def get_file_size(self, path: str) -> int:
         """Get the size of a file in bytes."""
         try:
-            return Path(path).stat().st_size
+            return os.stat(path).st_size
         except OSError:
             return 0
     
@@ -156,13 +325,14 @@ class FileSystemManager:
             return None
         
         try:
-            backup_path = f"{file_path}.backup"
-            counter = 1
-            
-            # Find a unique backup filename
-            while Path(backup_path).exists():
-                backup_path = f"{file_path}.backup.{counter}"
-                counter += 1
+            # Reserve a unique backup filename without probing existing backups
+            while True:
+                backup_path = f"{file_path}.backup.{time.time_ns()}"
+                try:
+                    os.close(os.open(backup_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                    break
+                except FileExistsError:
+                    continue
             
             shutil.copy2(file_path, backup_path)
             logger.debug(f"Created backup: {backup_path}")
@@ -186,6 +356,10 @@ class FileSystemManager:
             return True, "No conflict"
         
         if self.overwrite_existing:
+            # New content replaces the file atomically, so a backup is opt-in
+            if not self.backup_on_overwrite:
+                return True, "File will be overwritten"
+            
             # Create backup if possible
             backup_path = self.backup_existing_file(file_path)
             if backup_path:
@@ -205,38 +379,7 @@ class FileSystemManager:
         Returns:
             Sanitized filename safe for file systems
         """
-        # Remove or replace invalid characters
-        invalid_chars = '<>:"/\\|?*'
-        sanitized = filename
-        
-        for char in invalid_chars:
-            sanitized = sanitized.replace(char, '-')
-        
-        # Replace forward slashes specifically (common in Quip titles)
-        sanitized = sanitized.replace('/', '-')
-        
-        # Replace spaces with hyphens
-        sanitized = sanitized.replace(' ', '-')
-        
-        # Remove control characters
-        sanitized = ''.join(char for char in sanitized if ord(char) >= 32)
-        
-        # Remove multiple consecutive dashes
-        while '--' in sanitized:
-            sanitized = sanitized.replace('--', '-')
-        
-        # Strip leading/trailing dashes and whitespace
-        sanitized = sanitized.strip('- ')
-        
-        # Ensure it's not empty
-        if not sanitized:
-            sanitized = "untitled"
-        
-        # Limit length to avoid file system issues
-        if len(sanitized) > 200:
-            sanitized = sanitized[:200].rstrip('- ')
-        
-        return sanitized
+        return _sanitize(filename)
     
     def sanitize_folder_name(self, folder_name: str) -> str:
         """
@@ -291,35 +434,7 @@ class FileSystemManager:
         Returns:
             Number of directories removed
         """
-        if base_path is None:
-            base_path = str(self.base_path)
-        
-        removed_count = 0
-        base_path_obj = Path(base_path)
-        
-        try:
-            # Walk the directory tree bottom-up
-            for root, dirs, files in os.walk(base_path, topdown=False):
-                root_path = Path(root)
-                
-                # Skip the base directory itself
-                if root_path == base_path_obj:
-                    continue
-                
-                # Check if directory is empty
-                try:
-                    if not any(root_path.iterdir()):
-                        root_path.rmdir()
-                        removed_count += 1
-                        logger.debug(f"Removed empty directory: {root_path}")
-                except OSError as e:
-                    logger.debug(f"Could not remove directory {root_path}: {str(e)}")
-            
-            return removed_count
-            
-        except Exception as e:
-            logger.warning(f"Error during cleanup: {str(e)}")
-            return removed_count
+        return self.walk_and_analyze(base_path, cleanup=True)["removed_directories"]
     
     def get_directory_stats(self, path: Optional[str] = None) -> dict:
         """
@@ -331,6 +446,23 @@ class FileSystemManager:
         Returns:
             Dictionary with directory statistics
         """
+        return self.walk_and_analyze(path)
+    
+    def walk_and_analyze(self, path: Optional[str] = None, cleanup: bool = False) -> dict:
+        """
+        Collect directory statistics and optionally remove empty directories in one walk.
+        
+        Statistics describe the tree as found, before any cleanup. Removal
+        cascades, so a directory containing only empty directories is also
+        removed; the starting directory itself is never removed.
+        
+        Args:
+            path: Path to analyze (defaults to self.base_path)
+            cleanup: Whether to remove empty directories
+            
+        Returns:
+            Dictionary with directory statistics and the number of removed directories
+        """
         if path is None:
             path = str(self.base_path)
         
@@ -339,30 +471,73 @@ class FileSystemManager:
             "total_files": 0,
             "total_size": 0,
             "docx_files": 0,
-            "empty_directories": 0
+            "empty_directories": 0,
+            "removed_directories": 0
         }
         
         try:
-            for root, dirs, files in os.walk(path):
-                stats["total_directories"] += len(dirs)
-                stats["total_files"] += len(files)
+            # Iterative scandir walk: DirEntry caches type information, so
+            # no extra stat or Path allocation is needed per entry. Directories
+            # are recorded in visiting order (parents before children) with
+            # their entry counts so cleanup can run bottom-up without rescanning.
+            visited: List[Tuple[str, Optional[str]]] = []
+            entry_counts: Dict[str, Optional[int]] = {}
+            pending: List[Tuple[str, Optional[str]]] = [(path, None)]
+            
+            while pending:
+                current, parent = pending.pop()
+                visited.append((current, parent))
+                entry_count = 0
+                
+                try:
+                    with os.scandir(current) as entries:
+                        for entry in entries:
+                            entry_count += 1
+                            
+                            # Never follow symlinks: a link is counted as a file
+                            # with its own size and is never descended into
+                            if entry.is_dir(follow_symlinks=False):
+                                stats["total_directories"] += 1
+                                pending.append((entry.path, current))
+                                continue
+                            
+                            stats["total_files"] += 1
+                            try:
+                                stats["total_size"] += entry.stat(follow_symlinks=False).st_size
+                                if entry.name.endswith('.docx'):
+                                    stats["docx_files"] += 1
+                            except OSError:
+                                continue
+                except OSError as e:
+                    logger.debug(f"Could not scan directory {current}: {str(e)}")
+                    # Contents unknown, so never treat it as empty
+                    entry_counts[current] = None
+                    continue
+                
+                entry_counts[current] = entry_count
                 
                 # Check if current directory is empty
-                if not dirs and not files:
+                if entry_count == 0:
                     stats["empty_directories"] += 1
-                
-                for file in files:
-                    file_path = Path(root) / file
+            
+            if cleanup:
+                # Children always follow their parent in visiting order
+                for current, parent in reversed(visited):
+                    if parent is None or entry_counts.get(current) != 0:
+                        continue
+                    
                     try:
-                        file_size = file_path.stat().st_size
-                        stats["total_size"] += file_size
-                        
-                        if file.endswith('.docx'):
-                            stats["docx_files"] += 1
-                    except OSError:
+                        os.rmdir(current)
+                    except OSError as e:
+                        logger.debug(f"Could not remove directory {current}: {str(e)}")
                         continue
+                    
+                    stats["removed_directories"] += 1
+                    logger.debug(f"Removed empty directory: {current}")
+                    if entry_counts.get(parent) is not None:
+                        entry_counts[parent] -= 1
             
         except Exception as e:
-            logger.warning(f"Error calculating directory stats: {str(e)}")
+            logger.warning(f"Error walking directory {path}: {str(e)}")
         
         return stats
\ No newline at end of file
@@ -6,9 +6,31 @@ for configuration, Quip items, folder hierarchies, and processing results.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Union
 from pathlib import Path
 import re
+import functools
+
+
+# Every Quip folder URL accepted by the mirror starts with this prefix
+QUIP_URL_PREFIX = "https://quip-amazon.com/"
+
+# Invalid filename characters map to dashes; runs of dashes are then collapsed
+_INVALID_FILENAME_TABLE = str.maketrans({char: '-' for char in '<>:"/\\|?*'})
+_DASH_RUN = re.compile(r'-{2,}')
+
+
+@functools.lru_cache(maxsize=4096)
+def _sanitize_title(title: str) -> str:
+    """Sanitize a document title for use as a filename; cached per title."""
+    # Replace invalid filename characters (including '/', common in Quip titles)
+    sanitized = title.translate(_INVALID_FILENAME_TABLE)
+    # Remove multiple consecutive dashes
+    sanitized = _DASH_RUN.sub('-', sanitized)
+    # Strip leading/trailing dashes and whitespace
+    sanitized = sanitized.strip('- ')
+    # Ensure it's not empty
+    return sanitized or "untitled"
 
 
 @dataclass
@@ -16,25 +38,31 @@ class MirrorConfig:
     """Configuration for the mirroring operation."""
     
     quip_folder_url: str
-    target_path: str
+    target_path: Union[str, Path]  # Normalized to a Path after validation
     access_token: Optional[str] = None  # Will be resolved during execution
     overwrite_existing: bool = True
+    workers: int = 8  # Number of concurrent folder fetches and document exports
+    use_folder_cache: bool = True  # Revalidate cached folder listings instead of re-downloading
     
     def __post_init__(self):
         """Validate configuration after initialization."""
         self.validate()
+        self.target_path = Path(self.target_path)
     
     def validate(self) -> None:
         """Validate the configuration parameters."""
         if not self.quip_folder_url:
             raise ValueError("Quip folder URL is required")
         
-        if not self.quip_folder_url.startswith("https://quip-amazon.com/"):
-            raise ValueError("Quip URL must start with 'https://quip-amazon.com/'")
+        if not self.quip_folder_url.startswith(QUIP_URL_PREFIX):
+            raise ValueError(f"Quip URL must start with '{QUIP_URL_PREFIX}'")
         
         if not self.target_path:
             raise ValueError("Target path is required")
         
+        if self.workers < 1:
+            raise ValueError("Workers must be at least 1")
+        
         # Validate target path is writable
         target = Path(self.target_path)
         if target.exists() and not target.is_dir():
@@ -45,6 +73,9 @@ class MirrorConfig:
 class QuipItem:
     """Represents a Quip folder or document."""
     
+    # Large mirrors create one item per document; slots keep each instance small
+    __slots__ = ('id', 'name', 'type', 'url')
+    
     id: str
     name: str
     type: str  # 'folder' or 'document'
@@ -60,6 +91,21 @@ class QuipItem:
         
         if not self.name:
             raise ValueError("Item name is required")
+    
+    @classmethod
+    def from_api(cls, id: str, name: str, type: str, url: str) -> 'QuipItem':
+        """
+        Create an item from parsed API data without re-running validation.
+        
+        Only for internal callers that already guarantee a valid type and
+        non-empty ID and name; everything else should use the constructor.
+        """
+        item = cls.__new__(cls)
+        item.id = id
+        item.name = name
+        item.type = type
+        item.url = url
+        return item
 
 
 @dataclass
@@ -88,50 +134,117 @@ class FolderHierarchy:
     subfolders: Dict[str, 'FolderHierarchy'] = field(default_factory=dict)
     documents: List[QuipItem] = field(default_factory=list)
     
+    # Statistics cached by compute_stats()
+    _stats: Optional['HierarchyStats'] = field(default=None, init=False, repr=False, compare=False)
+    
+    # Issues cached by get_validation_issues(); cleared by compute_stats()
+    _validation_issues: Optional[List[str]] = field(default=None, init=False, repr=False, compare=False)
+    
     def get_all_documents(self) -> List['DocumentInfo']:
         """Get all documents in this hierarchy with path information."""
         all_docs = []
         
-        # Add documents in this folder
-        for doc in self.documents:
-            doc_info = DocumentInfo(
-                item=doc,
-                relative_path=self.root_folder.name,
-                local_file_path=""  # Will be set later
-            )
-            all_docs.append(doc_info)
-        
-        # Recursively add documents from subfolders
-        for subfolder_name, subfolder_hierarchy in self.subfolders.items():
-            subfolder_docs = subfolder_hierarchy.get_all_documents()
-            for doc_info in subfolder_docs:
-                # Update the relative path to include this folder
-                doc_info.relative_path = f"{self.root_folder.name}/{doc_info.relative_path}"
+        # Iterative pre-order walk; each folder's path is built once from its
+        # parent's, rather than re-prefixed on every document at each level
+        stack = [(self, self.root_folder.name)]
+        
+        while stack:
+            hierarchy, relative_path = stack.pop()
+            
+            # Add documents in this folder
+            for doc in hierarchy.documents:
+                doc_info = DocumentInfo(
+                    item=doc,
+                    relative_path=relative_path,
+                    local_file_path=""  # Will be set later
+                )
                 all_docs.append(doc_info)
+            
+            # Reversed so subfolders are visited in insertion order
+            for subfolder_hierarchy in reversed(list(hierarchy.subfolders.values())):
+                stack.append((subfolder_hierarchy, f"{relative_path}/{subfolder_hierarchy.root_folder.name}"))
         
         return all_docs
     
+    def compute_stats(self) -> 'HierarchyStats':
+        """
+        Compute all hierarchy statistics in one walk and cache the results.
+        
+        The cached statistics back get_stats(), total_folders and
+        total_documents; call this again after modifying the hierarchy to
+        refresh them (this also discards cached validation results).
+        
+        Returns:
+            HierarchyStats for this hierarchy
+        """
+        stats = HierarchyStats()
+        stack = [(self, 0)]
+        
+        while stack:
+            hierarchy, depth = stack.pop()
+            stats.total_folders += 1
+            stats.total_documents += len(hierarchy.documents)
+            stats.max_depth = max(stats.max_depth, depth)
+            
+            # A folder is empty if it has no documents and no subfolders
+            if not hierarchy.documents and not hierarchy.subfolders:
+                stats.empty_folders += 1
+            
+            stack.extend((subfolder, depth + 1) for subfolder in hierarchy.subfolders.values())
+        
+        self._stats = stats
+        self._validation_issues = None
+        return stats
+    
+    def get_stats(self) -> 'HierarchyStats':
+        """Get hierarchy statistics, computing them on first access."""
+        if self._stats is None:
+            return self.compute_stats()
+        return self._stats
+    
+    def get_validation_issues(self, validate: Callable[['FolderHierarchy'], List[str]]) -> List[str]:
+        """
+        Get validation issues for this hierarchy, running the validator on first access.
+        
+        The issues are cached until compute_stats() is called again.
+        
+        Args:
+            validate: Callable that returns the issues found in a hierarchy
+            
+        Returns:
+            Copy of the cached list of validation issues
+        """
+        if self._validation_issues is None:
+            self._validation_issues = list(validate(self))
+        return list(self._validation_issues)
+    
     @property
     def total_folders(self) -> int:
         """Total number of folders in this hierarchy."""
-        count = 1  # This folder
-        for subfolder in self.subfolders.values():
-            count += subfolder.total_folders
-        return count
+        return self.get_stats().total_folders
     
     @property
     def total_documents(self) -> int:
         """Total number of documents in this hierarchy."""
-        count = len(self.documents)
-        for subfolder in self.subfolders.values():
-            count += subfolder.total_documents
-        return count
+        return self.get_stats().total_documents
+
+
+@dataclass
+class HierarchyStats:
+    """Aggregate statistics for a folder hierarchy."""
+    
+    total_folders: int = 0
+    total_documents: int = 0
+    max_depth: int = 0  # Depth of the deepest folder; the root is depth 0
+    empty_folders: int = 0  # Folders with no documents and no subfolders
 
 
 @dataclass
 class DocumentInfo:
     """Information about a document with path details."""
     
+    __slots__ = ('item', 'relative_path', 'local_file_path')
+    
     item: QuipItem
     relative_path: str
     local_file_path: str
@@ -149,21 +262,11 @@ class DocumentContent:
     title: str
     content: str
     format: str  # 'html', 'markdown', etc.
+    updated_usec: Optional[int] = None  # Last modification time reported by Quip
     
     def sanitize_title_for_filename(self) -> str:
         """Sanitize the title for use as a filename."""
-        # Replace invalid filename characters
-        sanitized = re.sub(r'[<>:"/\\|?*]', '-', self.title)
-        # Replace forward slashes specifically (common in Quip titles)
-        sanitized = sanitized.replace('/', '-')
-        # Remove multiple consecutive dashes
-        sanitized = re.sub(r'-+', '-', sanitized)
-        # Strip leading/trailing dashes and whitespace
-        sanitized = sanitized.strip('- ')
-        # Ensure it's not empty
-        if not sanitized:
-            sanitized = "untitled"
-        return sanitized
+        return _sanitize_title(self.title)
 
 
 @dataclass
@@ -174,14 +277,15 @@ class ProcessingSummary:
     total_documents: int = 0
     successful_conversions: int = 0
     failed_conversions: int = 0
+    skipped_documents: int = 0
     errors: List[str] = field(default_factory=list)
     
     @property
     def success_rate(self) -> float:
-        """Calculate the success rate as a percentage."""
+        """Calculate the success rate as a percentage (skipped documents count as up to date)."""
         if self.total_documents == 0:
             return 100.0
-        return (self.successful_conversions / self.total_documents) * 100.0
+        return ((self.successful_conversions + self.skipped_documents) / self.total_documents) * 100.0
     
     def add_error(self, error: str) -> None:
         """Add an error to the summary."""
@@ -203,6 +307,29 @@ class ProcessingSummary:
             f"  Total documents: {self.total_documents}\n"
             f"  Successful conversions: {self.successful_conversions}\n"
             f"  Failed conversions: {self.failed_conversions}\n"
+            f"  Skipped documents: {self.skipped_documents}\n"
             f"  Success rate: {self.success_rate:.1f}%\n"
             f"  Errors: {len(self.errors)}"
-        )
\ No newline at end of file
+        )
+
+
+@dataclass
+class ConversionStats:
+    """Running export counters for a DocumentConverter, updated in place."""
+    
+    successful: int = 0
+    failed: int = 0
+    skipped: int = 0
+    
+    @property
+    def total(self) -> int:
+        """Total number of documents processed."""
+        return self.successful + self.failed + self.skipped
+    
+    @property
+    def success_rate(self) -> float:
+        """Calculate the success rate as a percentage of processed documents."""
+        total = self.total
+        if total == 0:
+            return 0.0
+        return (self.successful / total) * 100.0
\ No newline at end of file
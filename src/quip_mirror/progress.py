@@ -5,12 +5,14 @@ This module provides the ProgressReporter class that handles displaying
 progress information and user feedback during mirroring operations.
 """
 
+import os
 import sys
 import time
 import logging
+import functools
 from typing import Optional, List, Callable
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from datetime import timedelta
 
 from .models import ProcessingSummary
 
@@ -18,18 +20,24 @@ from .models import ProcessingSummary
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _terminal_supports_color() -> bool:
+    """Check once whether stdout is a terminal that supports color output."""
+    return (
+        hasattr(sys.stdout, 'isatty') and
+        sys.stdout.isatty() and
+        os.environ.get('TERM', 'dumb') != 'dumb'
+    )
+
+
 @dataclass
 class ProgressState:
     """Current state of progress tracking."""
     total_items: int = 0
     completed_items: int = 0
     current_item: str = ""
-    start_time: Optional[datetime] = None
-    errors: List[str] = None
-    
-    def __post_init__(self):
-        if self.errors is None:
-            self.errors = []
+    start_time: Optional[float] = None  # time.monotonic() when progress started
+    errors: List[str] = field(default_factory=list)
 
 
 class ProgressReporter:
@@ -48,6 +56,7 @@ class ProgressReporter:
         self.state = ProgressState()
         self._last_update_time = 0
         self._update_interval = 0.5  # Update every 500ms
+        self._last_line_length = 0
         
         # Color codes
         self.colors = {
@@ -58,39 +67,51 @@ class ProgressReporter:
             'reset': '\033[0m' if self.use_colors else '',
             'bold': '\033[1m' if self.use_colors else '',
         }
+        
+        # Progress line template with the colour codes baked in once
+        self._progress_format = (
+            f"\r{self.colors['blue']}[{{bar}}]{self.colors['reset']} "
+            "{percentage:5.1f}% ({completed}/{total}) {eta} | {item}"
+        )
     
     def start_progress(self, total_items: int, operation_name: str = "Processing") -> None:
         """
         Start progress tracking.
         
         Args:
-            total_items: Total number of items to process
+            total_items: Total number of items to process (0 if not known
+                yet; pass the total to update_progress as it grows)
             operation_name: Name of the operation being performed
         """
         self.state = ProgressState(
             total_items=total_items,
             completed_items=0,
             current_item="",
-            start_time=datetime.now(),
-            errors=[]
+            start_time=time.monotonic()
         )
         
         if self.verbose:
             print(f"\n{self.colors['bold']}{operation_name}{self.colors['reset']}")
-            print(f"Total items to process: {self.colors['blue']}{total_items}{self.colors['reset']}")
+            if total_items:
+                print(f"Total items to process: {self.colors['blue']}{total_items}{self.colors['reset']}")
             print("-" * 50)
     
-    def update_progress(self, current_item: str, completed: Optional[int] = None) -> None:
+    def update_progress(self, current_item: str, completed: Optional[int] = None,
+                        total: Optional[int] = None) -> None:
         """
         Update progress with current item information.
         
         Args:
             current_item: Name/description of current item being processed
             completed: Optional explicit completed count (auto-increments if None)
+            total: Optional new total, for work that is still being discovered
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         
         # Update state
+        if total is not None:
+            self.state.total_items = total
+        
         if completed is not None:
             self.state.completed_items = completed
         else:
@@ -163,7 +184,7 @@ class ProgressReporter:
             return
         
         # Calculate elapsed time
-        elapsed_time = datetime.now() - self.state.start_time if self.state.start_time else timedelta(0)
+        elapsed_time = time.monotonic() - self.state.start_time if self.state.start_time else 0.0
         
         print("\n" + "=" * 60)
         print(f"{self.colors['bold']}MIRRORING COMPLETE{self.colors['reset']}")
@@ -174,6 +195,7 @@ class ProgressReporter:
         print(f"Total documents found: {self.colors['blue']}{summary.total_documents}{self.colors['reset']}")
         print(f"Successful conversions: {self.colors['green']}{summary.successful_conversions}{self.colors['reset']}")
         print(f"Failed conversions: {self.colors['red']}{summary.failed_conversions}{self.colors['reset']}")
+        print(f"Skipped documents: {self.colors['yellow']}{summary.skipped_documents}{self.colors['reset']}")
         print(f"Success rate: {self.colors['green']}{summary.success_rate:.1f}%{self.colors['reset']}")
         print(f"Total time: {self.colors['blue']}{self._format_duration(elapsed_time)}{self.colors['reset']}")
         
@@ -209,37 +231,45 @@ class ProgressReporter:
             current_item = current_item[:37] + "..."
         
         # Display progress line
-        progress_line = (
-            f"\r{self.colors['blue']}[{bar}]{self.colors['reset']} "
-            f"{percentage:5.1f}% "
-            f"({self.state.completed_items}/{self.state.total_items}) "
-            f"{eta_str} "
-            f"| {current_item}"
+        progress_line = self._progress_format.format(
+            bar=bar,
+            percentage=percentage,
+            completed=self.state.completed_items,
+            total=self.state.total_items,
+            eta=eta_str,
+            item=current_item
         )
         
-        # Clear the line and print progress
-        print(" " * 100, end="\r")  # Clear line
-        print(progress_line, end="", flush=True)
+        # Overwrite the previous line: ANSI terminals erase to end of line,
+        # others get padding over whatever the last line left behind
+        if self.use_colors:
+            sys.stdout.write(f"{progress_line}\x1b[K")
+        else:
+            padding = max(0, self._last_line_length - len(progress_line))
+            self._last_line_length = len(progress_line)
+            sys.stdout.write(progress_line + " " * padding)
+        sys.stdout.flush()
     
     def _calculate_eta(self) -> str:
         """Calculate estimated time of arrival."""
         if not self.state.start_time or self.state.completed_items == 0:
             return "ETA: --:--"
         
-        elapsed = datetime.now() - self.state.start_time
-        rate = self.state.completed_items / elapsed.total_seconds()
+        elapsed = time.monotonic() - self.state.start_time
+        if elapsed <= 0:
+            return "ETA: --:--"
+        rate = self.state.completed_items / elapsed
         
         if rate > 0:
             remaining_items = self.state.total_items - self.state.completed_items
             eta_seconds = remaining_items / rate
-            eta = timedelta(seconds=int(eta_seconds))
-            return f"ETA: {self._format_duration(eta)}"
+            return f"ETA: {self._format_duration(eta_seconds)}"
         else:
             return "ETA: --:--"
     
-    def _format_duration(self, duration: timedelta) -> str:
-        """Format a duration for display."""
-        total_seconds = int(duration.total_seconds())
+    def _format_duration(self, duration: float) -> str:
+        """Format a duration in seconds for display."""
+        total_seconds = int(duration)
         hours, remainder = divmod(total_seconds, 3600)
         minutes, seconds = divmod(remainder, 60)
         
@@ -250,13 +280,7 @@ class ProgressReporter:
     
     def _supports_color(self) -> bool:
         """Check if the terminal supports color output."""
-        # Simple check for color support
-        return (
-            hasattr(sys.stdout, 'isatty') and 
-            sys.stdout.isatty() and 
-            'TERM' in os.environ and 
-            os.environ['TERM'] != 'dumb'
-        )
+        return _terminal_supports_color()
     
     def set_verbosity(self, verbose: bool) -> None:
         """Set verbosity level."""
@@ -271,7 +295,7 @@ class ProgressReporter:
     def get_elapsed_time(self) -> timedelta:
         """Get elapsed time since progress started."""
         if self.state.start_time:
-            return datetime.now() - self.state.start_time
+            return timedelta(seconds=time.monotonic() - self.state.start_time)
         return timedelta(0)
     
     def create_callback(self) -> Callable:
@@ -284,8 +308,4 @@ class ProgressReporter:
         def progress_callback(current: int, total: int, item_name: str):
             self.update_progress(item_name, current)
         
-        return progress_callback
-
-
-# Import os for environment variable check
-import os
\ No newline at end of file
+        return progress_callback
\ No newline at end of file
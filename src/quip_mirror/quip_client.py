@@ -5,20 +5,35 @@ This module provides the QuipAPIClient class that handles all communication
 with Quip's REST API for folder listing, document metadata, and DOCX export.
 """
 
-import re
+import os
+import json
 import time
+import sqlite3
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, Optional, Tuple
-from urllib.parse import urlparse, parse_qs
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-from .models import QuipItem, FolderContents, DocumentContent
+from .models import QUIP_URL_PREFIX, QuipItem, FolderContents, DocumentContent
+
+# orjson parses large folder listings considerably faster; it is optional
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 
 logger = logging.getLogger(__name__)
 
+# Streaming parameters for DOCX downloads
+EXPORT_CHUNK_SIZE = 64 * 1024
+EXPORT_BUFFER_SIZE = 1024 * 1024
+
 
 class QuipAPIError(Exception):
     """Exception raised for Quip API errors."""
@@ -29,10 +44,153 @@ class QuipAPIError(Exception):
         self.response_text = response_text
 
 
+class RateLimiter:
+    """Thread-safe token bucket limiting how many requests may be issued per period."""
+    
+    def __init__(self, max_requests: float, period: float = 60.0):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            max_requests: Number of requests allowed per period (may be fractional)
+            period: Length of the period in seconds
+        """
+        if max_requests <= 0:
+            raise ValueError("max_requests must be positive")
+        
+        # The bucket must hold at least one token for acquire() to ever succeed
+        self.capacity = max(1.0, float(max_requests))
+        self.fill_rate = max_requests / period
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a request may be issued, then consume one token."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.fill_rate)
+                self._last_refill = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                wait_time = (1 - self._tokens) / self.fill_rate
+            
+            time.sleep(wait_time)
+
+
+class FolderCache:
+    """
+    Persistent SQLite cache of folder listings, revalidated with ETags.
+    
+    Stores the raw JSON body of each folder listing together with the ETag it
+    was served with. The cache is best-effort: database errors are logged and
+    treated as cache misses. Safe to share between threads.
+    """
+    
+    # Cache file name, kept alongside the mirrored documents
+    FILENAME = ".quip_mirror_folders.sqlite3"
+    
+    def __init__(self, path: str):
+        """
+        Open (or create) a folder cache.
+        
+        Args:
+            path: Path of the SQLite database file
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS folders ("
+            "folder_id TEXT PRIMARY KEY, etag TEXT NOT NULL, payload BLOB NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+    
+    def get(self, folder_id: str) -> Optional[Tuple[str, bytes]]:
+        """
+        Look up a cached folder listing.
+        
+        Args:
+            folder_id: Quip folder ID
+            
+        Returns:
+            Tuple of (etag, payload), or None if the folder is not cached
+        """
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT etag, payload FROM folders WHERE folder_id = ?", (folder_id,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read folder cache {self.path}: {str(e)}")
+            return None
+        
+        return (row[0], bytes(row[1])) if row else None
+    
+    def put(self, folder_id: str, etag: str, payload: bytes) -> None:
+        """
+        Store a folder listing.
+        
+        Args:
+            folder_id: Quip folder ID
+            etag: ETag the listing was served with
+            payload: Raw JSON response body
+        """
+        try:
+            with self._lock:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO folders (folder_id, etag, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                    (folder_id, etag, payload, time.time())
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write folder cache {self.path}: {str(e)}")
+    
+    def record(self, hit: bool) -> None:
+        """
+        Count a folder listing that was served from the cache or refetched.
+        
+        Args:
+            hit: Whether the cached listing was still current
+        """
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+    
+    def close(self) -> None:
+        """Commit pending entries and close the database."""
+        with self._lock:
+            try:
+                self._connection.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not save folder cache {self.path}: {str(e)}")
+            finally:
+                self._connection.close()
+
+
 class QuipAPIClient:
     """Client for interacting with Quip's REST API."""
     
-    def __init__(self, access_token: str, timeout: int = 30, max_retries: int = 3):
+    # Quip allows roughly 100 requests per minute per user; stay safely below it
+    DEFAULT_REQUESTS_PER_MINUTE = 90
+    
+    # Sessions shared by clients with the same token and connection settings,
+    # so keep-alive connections survive across client instances. Keyed by a
+    # hash of the token so the cache holds no plaintext tokens.
+    MAX_CACHED_SESSIONS = 8
+    _session_cache: 'OrderedDict[Tuple[str, int, int], requests.Session]' = OrderedDict()
+    _session_lock = threading.Lock()
+    
+    def __init__(self, access_token: str, timeout: int = 30, max_retries: int = 3,
+                 requests_per_minute: Optional[int] = None, pool_size: int = 10,
+                 folder_cache: Optional[FolderCache] = None):
         """
         Initialize the Quip API client.
         
@@ -40,28 +198,73 @@ class QuipAPIClient:
             access_token: Quip personal access token
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
+            requests_per_minute: Optional cap on API requests per minute, shared
+                by all threads using this client
+            pool_size: Maximum number of pooled connections per host
+            folder_cache: Optional FolderCache; cached folder listings are
+                revalidated with If-None-Match instead of re-downloaded
         """
         self.access_token = access_token
         self.base_url = "https://platform.quip-amazon.com/1"
         self.timeout = timeout
+        self.pool_size = pool_size
+        self.rate_limiter = RateLimiter(requests_per_minute) if requests_per_minute else None
+        self.folder_cache = folder_cache
         
-        # Set up session with retry strategy
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=max_retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"]
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        self.session = self._get_session(access_token, max_retries, pool_size)
+    
+    @classmethod
+    def _get_session(cls, access_token: str, max_retries: int, pool_size: int) -> requests.Session:
+        """Return the shared session for these settings, creating it on first use."""
+        token_hash = hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+        key = (token_hash, max_retries, pool_size)
         
-        # Set default headers
-        self.session.headers.update({
-            "Authorization": f"Bearer {access_token}",
-            "User-Agent": "QuipFolderMirror/0.1.0"
-        })
+        with cls._session_lock:
+            session = cls._session_cache.get(key)
+            if session is not None:
+                cls._session_cache.move_to_end(key)
+                return session
+            
+            # Set up session with retry strategy
+            session = requests.Session()
+            retry_strategy = Retry(
+                total=max_retries,
+                backoff_factor=1,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET"]
+            )
+            adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            
+            # Set default headers
+            session.headers.update({
+                "Authorization": f"Bearer {access_token}",
+                "User-Agent": "QuipFolderMirror/0.1.0"
+            })
+            
+            cls._session_cache[key] = session
+            
+            # Drop the least recently used sessions beyond the limit
+            while len(cls._session_cache) > cls.MAX_CACHED_SESSIONS:
+                _, evicted = cls._session_cache.popitem(last=False)
+                evicted.close()
+            
+            return session
+    
+    @classmethod
+    def close_sessions(cls) -> None:
+        """Close and forget all shared sessions."""
+        with cls._session_lock:
+            for session in cls._session_cache.values():
+                session.close()
+            cls._session_cache.clear()
+    
+    def _get(self, url: str, stream: bool = False, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """Issue a GET request, waiting for the rate limiter if one is configured."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return self.session.get(url, timeout=self.timeout, stream=stream, headers=headers)
     
     def extract_folder_id_from_url(self, url: str) -> str:
         """
@@ -76,12 +279,12 @@ class QuipAPIClient:
         Raises:
             QuipAPIError: If URL is invalid or folder ID cannot be extracted
         """
-        if not url.startswith("https://quip-amazon.com/"):
-            raise QuipAPIError(f"Invalid Quip URL. Must start with 'https://quip-amazon.com/': {url}")
+        if not url.startswith(QUIP_URL_PREFIX):
+            raise QuipAPIError(f"Invalid Quip URL. Must start with '{QUIP_URL_PREFIX}': {url}")
         
-        # Parse the URL to extract folder ID
-        parsed = urlparse(url)
-        path_parts = parsed.path.strip('/').split('/')
+        # The prefix fixes scheme and host, so the path is everything up to any query or fragment
+        path = url[len(QUIP_URL_PREFIX):].split('?', 1)[0].split('#', 1)[0]
+        path_parts = path.strip('/').split('/')
         
         # Handle different URL formats:
         # https://quip-amazon.com/folder/ABC123
@@ -97,7 +300,7 @@ class QuipAPIClient:
             raise QuipAPIError(f"Cannot extract folder ID from URL: {url}")
         
         # Validate folder ID format (alphanumeric)
-        if not re.match(r'^[a-zA-Z0-9]+$', folder_id):
+        if not (folder_id.isascii() and folder_id.isalnum()):
             raise QuipAPIError(f"Invalid folder ID format: {folder_id}")
         
         logger.debug(f"Extracted folder ID '{folder_id}' from URL: {url}")
@@ -117,10 +320,17 @@ class QuipAPIClient:
             QuipAPIError: If API request fails
         """
         url = f"{self.base_url}/folders/{folder_id}"
+        cached = self.folder_cache.get(folder_id) if self.folder_cache is not None else None
         
         try:
-            logger.debug(f"Fetching folder contents for ID: {folder_id}")
-            response = self.session.get(url, timeout=self.timeout)
+            logger.debug("Fetching folder contents for ID: %s", folder_id)
+            response = self._get(url, headers={"If-None-Match": cached[0]} if cached else None)
+            
+            # Unchanged since it was cached: reuse the stored listing
+            if response.status_code == 304 and cached:
+                logger.debug("Folder %s not modified, using cached contents", folder_id)
+                self.folder_cache.record(hit=True)
+                return self._parse_folder_contents(_json_loads(cached[1]))
             
             if response.status_code == 401:
                 raise QuipAPIError("Authentication failed. Please check your access token.", 401, response.text)
@@ -135,8 +345,17 @@ class QuipAPIClient:
                     response.text
                 )
             
-            data = response.json()
-            return self._parse_folder_contents(data)
+            data = _json_loads(response.content)
+            contents = self._parse_folder_contents(data)
+            
+            if self.folder_cache is not None:
+                self.folder_cache.record(hit=False)
+                
+                etag = response.headers.get("ETag")
+                if etag:
+                    self.folder_cache.put(folder_id, etag, response.content)
+            
+            return contents
             
         except requests.exceptions.Timeout:
             raise QuipAPIError(f"Timeout while fetching folder {folder_id}")
@@ -161,8 +380,8 @@ class QuipAPIClient:
         url = f"{self.base_url}/threads/{thread_id}"
         
         try:
-            logger.debug(f"Fetching document metadata for ID: {thread_id}")
-            response = self.session.get(url, timeout=self.timeout)
+            logger.debug("Fetching document metadata for ID: %s", thread_id)
+            response = self._get(url)
             
             if response.status_code == 401:
                 raise QuipAPIError("Authentication failed. Please check your access token.", 401, response.text)
@@ -177,13 +396,14 @@ class QuipAPIClient:
                     response.text
                 )
             
-            data = response.json()
+            data = _json_loads(response.content)
             thread_info = data.get("thread", {})
             
             return DocumentContent(
                 title=thread_info.get("title", "Untitled"),
                 content="",  # Content not needed for metadata
-                format="quip"
+                format="quip",
+                updated_usec=thread_info.get("updated_usec")
             )
             
         except requests.exceptions.Timeout:
@@ -210,9 +430,14 @@ class QuipAPIClient:
         export_url = f"{self.base_url}/threads/{thread_id}/export/docx"
         
         try:
-            logger.debug(f"Exporting document {thread_id} to {file_path}")
-            response = self.session.get(export_url, timeout=self.timeout)
-            
+            logger.debug("Exporting document %s to %s", thread_id, file_path)
+            response = self._get(export_url, stream=True)
+        except requests.exceptions.Timeout:
+            raise QuipAPIError(f"Timeout while exporting document {thread_id}")
+        except requests.exceptions.RequestException as e:
+            raise QuipAPIError(f"Network error while exporting document {thread_id}: {str(e)}")
+        
+        try:
             if response.status_code == 401:
                 raise QuipAPIError("Authentication failed. Please check your access token.", 401, response.text)
             elif response.status_code == 403:
@@ -226,11 +451,19 @@ class QuipAPIClient:
                     response.text
                 )
             
-            # Write binary content to file
-            with open(file_path, "wb") as f:
-                f.write(response.content)
+            # Stream the body to disk instead of holding the whole document in memory
+            with open(file_path, "wb", buffering=EXPORT_BUFFER_SIZE) as f:
+                for chunk in response.iter_content(chunk_size=EXPORT_CHUNK_SIZE):
+                    f.write(chunk)
+                f.flush()
+                
+                # The exported file won't be read again soon; hint that its page
+                # cache can go. Best effort: pages still dirty are left for the
+                # kernel to write back and evict as usual
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
             
-            logger.debug(f"Successfully exported document {thread_id} to {file_path}")
+            logger.debug("Successfully exported document %s to %s", thread_id, file_path)
             return True
             
         except requests.exceptions.Timeout:
@@ -239,6 +472,8 @@ class QuipAPIClient:
             raise QuipAPIError(f"Network error while exporting document {thread_id}: {str(e)}")
         except IOError as e:
             raise QuipAPIError(f"Failed to write file {file_path}: {str(e)}")
+        finally:
+            response.close()
     
     def _parse_folder_contents(self, data: Dict[str, Any]) -> FolderContents:
         """
@@ -250,37 +485,36 @@ class QuipAPIClient:
         Returns:
             FolderContents object
         """
-        folders = []
-        documents = []
-        
         # Extract the folder name from the response
         folder_info = data.get("folder", {})
         folder_name = folder_info.get("title", "Untitled Folder")
         
-        children = data.get("children", [])
+        children = data.get("children", ())
         
-        for child in children:
-            if "folder_id" in child:
-                # This is a subfolder
-                folder_item = QuipItem(
-                    id=child["folder_id"],
-                    name=child.get("title", "Untitled Folder"),
-                    type="folder",
-                    url=f"https://quip-amazon.com/folder/{child['folder_id']}"
-                )
-                folders.append(folder_item)
-                
-            elif "thread_id" in child:
-                # This is a document
-                document_item = QuipItem(
-                    id=child["thread_id"],
-                    name=child.get("title", "Untitled Document"),
-                    type="document",
-                    url=f"https://quip-amazon.com/{child['thread_id']}"
-                )
-                documents.append(document_item)
+        # Subfolders carry a folder_id; documents carry a thread_id. Items are
+        # built through the unvalidated fast path, so guarantee non-empty names.
+        folders = [
+            QuipItem.from_api(
+                id=child["folder_id"],
+                name=child.get("title") or "Untitled Folder",
+                type="folder",
+                url=f"{QUIP_URL_PREFIX}folder/{child['folder_id']}"
+            )
+            for child in children
+            if child.get("folder_id")
+        ]
+        documents = [
+            QuipItem.from_api(
+                id=child["thread_id"],
+                name=child.get("title") or "Untitled Document",
+                type="document",
+                url=f"{QUIP_URL_PREFIX}{child['thread_id']}"
+            )
+            for child in children
+            if child.get("thread_id") and "folder_id" not in child
+        ]
         
-        logger.debug(f"Parsed folder contents: {len(folders)} folders, {len(documents)} documents")
+        logger.debug("Parsed folder contents: %d folders, %d documents", len(folders), len(documents))
         return FolderContents(folders=folders, documents=documents, folder_name=folder_name)
     
     def is_folder(self, item: Dict[str, Any]) -> bool:
@@ -301,7 +535,7 @@ class QuipAPIClient:
         try:
             # Try to access the user's info endpoint
             url = f"{self.base_url}/users/current"
-            response = self.session.get(url, timeout=self.timeout)
+            response = self._get(url)
             
             if response.status_code == 200:
                 return True, "Connection successful"
@@ -1,13 +1,17 @@
 """
 Folder traversal logic for Quip folder structures.
 
-This module provides the FolderTraverser class that recursively discovers
+This module provides the FolderTraverser class that concurrently discovers
 and maps Quip folder hierarchies using the API client.
 """
 
 import logging
-from typing import Dict, List, Set, Optional
-from .models import QuipItem, FolderContents, FolderHierarchy, DocumentInfo
+import warnings
+import itertools
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+from .models import QUIP_URL_PREFIX, QuipItem, FolderContents, FolderHierarchy, DocumentInfo
 from .quip_client import QuipAPIClient, QuipAPIError
 
 
@@ -19,24 +23,45 @@ class TraversalError(Exception):
     pass
 
 
+@dataclass
+class _FolderVisit:
+    """A folder reached during a concurrent walk."""
+    
+    key: int  # Unique per visit; folders reachable by several paths get several keys
+    parent_key: Optional[int]  # None for the root
+    folder_id: str
+    contents: Optional[FolderContents]  # None for circular references
+    depth: int
+    relative_path: str  # '/'-separated folder names from the root
+
+
 class FolderTraverser:
-    """Handles recursive traversal of Quip folder structures."""
+    """Handles traversal of Quip folder structures."""
     
-    def __init__(self, client: QuipAPIClient, max_depth: int = 50):
+    # Default number of concurrent folder requests
+    DEFAULT_MAX_WORKERS = 8
+    
+    def __init__(self, client: QuipAPIClient, max_depth: int = 50, max_workers: Optional[int] = None):
         """
         Initialize the folder traverser.
         
         Args:
             client: QuipAPIClient instance for API calls
-            max_depth: Maximum recursion depth to prevent infinite loops
+            max_depth: Maximum folder depth to prevent infinite loops
+            max_workers: Maximum concurrent folder requests (defaults to DEFAULT_MAX_WORKERS)
         """
         self.client = client
         self.max_depth = max_depth
-        self._visited_folders: Set[str] = set()
+        self.max_workers = max_workers or self.DEFAULT_MAX_WORKERS
+        self.folders_visited = 0  # Folders reached by the latest iter_documents() call
+        self.failed_folders: List[Tuple[str, str, Exception]] = []  # (ID, name, error) from the latest walk
     
     def traverse(self, root_folder_id: str) -> FolderHierarchy:
         """
-        Traverse a Quip folder structure recursively.
+        Traverse a Quip folder structure.
+        
+        Folder contents are fetched concurrently, with each folder's
+        subfolders requested as soon as the folder itself has loaded.
         
         Args:
             root_folder_id: ID of the root folder to start traversal
@@ -48,106 +73,235 @@ class FolderTraverser:
             TraversalError: If traversal fails
         """
         logger.info(f"Starting traversal of folder: {root_folder_id}")
-        self._visited_folders.clear()
         
         try:
-            hierarchy = self._traverse_recursive(root_folder_id, depth=0)
+            hierarchy = self._traverse_concurrent(root_folder_id)
+            stats = hierarchy.compute_stats()
             logger.info(f"Completed traversal of '{hierarchy.root_folder.name}' - "
-                       f"found {hierarchy.total_folders} folders and {hierarchy.total_documents} documents")
+                       f"found {stats.total_folders} folders and {stats.total_documents} documents")
             return hierarchy
         except QuipAPIError as e:
             raise TraversalError(f"API error during traversal: {str(e)}") from e
         except Exception as e:
             raise TraversalError(f"Unexpected error during traversal: {str(e)}") from e
     
-    def _traverse_recursive(self, folder_id: str, depth: int = 0) -> FolderHierarchy:
+    def iter_documents(self, root_folder_id: str) -> Iterator[DocumentInfo]:
         """
-        Recursively traverse a folder and its subfolders.
+        Yield documents as their folders are discovered.
+        
+        Unlike traverse(), no FolderHierarchy is kept, so memory stays bounded
+        and callers can start processing documents while deeper folders are
+        still being listed. Documents are yielded in discovery order.
         
         Args:
-            folder_id: ID of the folder to traverse
-            depth: Current recursion depth
+            root_folder_id: ID of the root folder to start traversal
             
-        Returns:
-            FolderHierarchy for this folder and all subfolders
+        Yields:
+            DocumentInfo objects with relative path information
             
         Raises:
-            TraversalError: If traversal fails or max depth exceeded
+            TraversalError: If traversal fails
         """
-        # Check for maximum depth to prevent infinite recursion
-        if depth > self.max_depth:
-            raise TraversalError(f"Maximum traversal depth ({self.max_depth}) exceeded")
-        
-        # Check for circular references
-        if folder_id in self._visited_folders:
-            logger.warning(f"Circular reference detected for folder {folder_id}, skipping")
-            # Return empty hierarchy to avoid infinite loops
-            root_item = QuipItem(
-                id=folder_id,
-                name=f"Circular Reference: {folder_id}",
-                type="folder",
-                url=f"https://quip-amazon.com/folder/{folder_id}"
-            )
-            return FolderHierarchy(root_folder=root_item)
+        logger.info(f"Starting streaming traversal of folder: {root_folder_id}")
         
-        # Mark this folder as visited
-        self._visited_folders.add(folder_id)
+        self.folders_visited = 0
         
         try:
-            # Get folder contents from API
-            folder_contents = self.client.get_folder_contents(folder_id)
-            folder_name = folder_contents.folder_name or f"Folder {folder_id}"
-            logger.debug(f"Traversing folder '{folder_name}' ({folder_id}) at depth {depth}")
+            for visit in self._walk(root_folder_id):
+                self.folders_visited += 1
+                if visit.contents is None:
+                    continue
+                
+                for doc in visit.contents.documents:
+                    yield DocumentInfo(
+                        item=doc,
+                        relative_path=visit.relative_path,
+                        local_file_path=""  # Will be set by FileSystemManager
+                    )
+        except QuipAPIError as e:
+            raise TraversalError(f"API error during traversal: {str(e)}") from e
+    
+    def _traverse_concurrent(self, root_folder_id: str) -> FolderHierarchy:
+        """
+        Build a folder hierarchy from a concurrent walk.
+        
+        Args:
+            root_folder_id: ID of the root folder
             
-            # Create root folder item using the actual name from the API
-            root_item = QuipItem(
-                id=folder_id,
-                name=folder_name,  # Use actual name from API
-                type="folder",
-                url=f"https://quip-amazon.com/folder/{folder_id}"
-            )
+        Returns:
+            FolderHierarchy for the root folder and all subfolders
             
-            # Initialize hierarchy
-            hierarchy = FolderHierarchy(
-                root_folder=root_item,
-                documents=folder_contents.documents
-            )
+        Raises:
+            QuipAPIError: If the root folder cannot be fetched
+        """
+        nodes: Dict[int, FolderHierarchy] = {}
+        
+        # Every fetched folder with its listed subfolders, for restoring listing order at the end
+        listed: List[Tuple[FolderHierarchy, List[QuipItem]]] = []
+        
+        for visit in self._walk(root_folder_id):
+            if visit.contents is None:
+                # Keep an empty placeholder for circular references
+                node = FolderHierarchy(root_folder=QuipItem(
+                    id=visit.folder_id,
+                    name=f"Circular Reference: {visit.folder_id}",
+                    type="folder",
+                    url=f"{QUIP_URL_PREFIX}folder/{visit.folder_id}"
+                ))
+            else:
+                node = self._build_hierarchy(visit.folder_id, visit.contents, visit.depth)
+                nodes[visit.key] = node
+                listed.append((node, visit.contents.folders))
             
-            # Recursively traverse subfolders
-            for subfolder in folder_contents.folders:
-                try:
-                    logger.debug(f"Recursively traversing subfolder: {subfolder.name} ({subfolder.id})")
-                    subfolder_hierarchy = self._traverse_recursive(subfolder.id, depth + 1)
-                    hierarchy.subfolders[subfolder.id] = subfolder_hierarchy
-                    
-                except QuipAPIError as e:
-                    logger.error(f"Failed to traverse subfolder '{subfolder.name}' ({subfolder.id}): {str(e)}")
-                    # Continue with other subfolders instead of failing completely
-                    continue
-                except Exception as e:
-                    logger.error(f"Unexpected error traversing subfolder '{subfolder.name}' ({subfolder.id}): {str(e)}")
-                    continue
+            if visit.parent_key is not None:
+                nodes[visit.parent_key].subfolders[visit.folder_id] = node
+        
+        # Fetches complete in any order; put subfolders back in listing order
+        for hierarchy, folders in listed:
+            if len(hierarchy.subfolders) > 1:
+                hierarchy.subfolders = {
+                    folder.id: hierarchy.subfolders[folder.id]
+                    for folder in folders
+                    if folder.id in hierarchy.subfolders
+                }
+        
+        return nodes[0]
+    
+    def _walk(self, root_folder_id: str) -> Iterator['_FolderVisit']:
+        """
+        Fetch a folder tree concurrently, yielding each folder as it loads.
+        
+        Each folder's subfolders are scheduled as soon as its own contents
+        arrive, so a slow folder never holds up unrelated branches. At most
+        max_workers requests are in flight at once. A folder is always
+        yielded after its parent.
+        
+        Subfolders that fail to load are skipped and recorded in
+        failed_folders, with one summary logged when the walk ends.
+        Subfolders that exceed the maximum depth are logged and skipped.
+        Subfolders that point back at one of their ancestors are yielded
+        without contents.
+        
+        Args:
+            root_folder_id: ID of the root folder
             
-            logger.debug(f"Completed traversal of folder '{folder_name}' ({folder_id}): "
-                        f"{len(hierarchy.subfolders)} subfolders, {len(hierarchy.documents)} documents")
+        Yields:
+            _FolderVisit for every folder reached; the root has key 0
             
-            return hierarchy
+        Raises:
+            QuipAPIError: If the root folder cannot be fetched
+        """
+        self.failed_folders = failed = []
+        root_contents = self.client.get_folder_contents(root_folder_id)
+        keys = itertools.count(1)
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Maps each in-flight fetch to (parent key, subfolder item, depth, ancestor IDs, parent path)
+            pending: Dict[Future, Tuple[int, QuipItem, int, FrozenSet[str], str]] = {}
+            
+            def schedule(key: int, contents: FolderContents, depth: int,
+                         ancestors: FrozenSet[str], path: str) -> List[_FolderVisit]:
+                circular = []
+                
+                for subfolder in contents.folders:
+                    if depth >= self.max_depth:
+                        logger.error(f"Failed to traverse subfolder '{subfolder.name}' ({subfolder.id}): "
+                                    f"Maximum traversal depth ({self.max_depth}) exceeded")
+                        continue
+                    
+                    # Check for circular references
+                    if subfolder.id in ancestors:
+                        logger.warning(f"Circular reference detected for folder {subfolder.id}, skipping")
+                        circular.append(_FolderVisit(
+                            next(keys), key, subfolder.id, None, depth + 1,
+                            f"{path}/Circular Reference: {subfolder.id}"
+                        ))
+                        continue
+                    
+                    future = executor.submit(self.client.get_folder_contents, subfolder.id)
+                    pending[future] = (key, subfolder, depth + 1, ancestors, path)
+                
+                return circular
             
-        finally:
-            # Remove from visited set when we're done with this branch
-            # This allows the same folder to be visited in different branches if needed
-            self._visited_folders.discard(folder_id)
+            try:
+                root_path = self._folder_name(root_folder_id, root_contents)
+                circular = schedule(0, root_contents, 0, frozenset((root_folder_id,)), root_path)
+                yield _FolderVisit(0, None, root_folder_id, root_contents, 0, root_path)
+                yield from circular
+                
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    
+                    for future in done:
+                        parent_key, subfolder, depth, ancestors, parent_path = pending.pop(future)
+                        
+                        try:
+                            contents = future.result()
+                        except Exception as e:
+                            # Continue with other subfolders instead of failing completely
+                            failed.append((subfolder.id, subfolder.name, e))
+                            continue
+                        
+                        key = next(keys)
+                        path = f"{parent_path}/{self._folder_name(subfolder.id, contents)}"
+                        circular = schedule(key, contents, depth, ancestors | {subfolder.id}, path)
+                        yield _FolderVisit(key, parent_key, subfolder.id, contents, depth, path)
+                        yield from circular
+            finally:
+                # Don't start queued fetches if the caller stops early
+                for future in pending:
+                    future.cancel()
+                
+                if failed:
+                    logger.error(f"Skipped {len(failed)} subfolders that could not be fetched")
+                    for folder_id, name, error in failed:
+                        logger.debug("Failed to traverse subfolder '%s' (%s): %s", name, folder_id, error)
+    
+    @staticmethod
+    def _folder_name(folder_id: str, folder_contents: FolderContents) -> str:
+        """Get the display name of a fetched folder."""
+        return folder_contents.folder_name or f"Folder {folder_id}"
+    
+    def _build_hierarchy(self, folder_id: str, folder_contents: FolderContents, depth: int) -> FolderHierarchy:
+        """Create the hierarchy node for a fetched folder, without its subfolders."""
+        folder_name = self._folder_name(folder_id, folder_contents)
+        # Called once per folder: let logging skip the formatting when debug is off
+        logger.debug("Traversing folder '%s' (%s) at depth %d: %d subfolders, %d documents",
+                     folder_name, folder_id, depth, len(folder_contents.folders), len(folder_contents.documents))
+        
+        # Create root folder item using the actual name from the API
+        root_item = QuipItem(
+            id=folder_id,
+            name=folder_name,
+            type="folder",
+            url=f"{QUIP_URL_PREFIX}folder/{folder_id}"
+        )
+        
+        return FolderHierarchy(
+            root_folder=root_item,
+            documents=folder_contents.documents
+        )
     
     def get_folder_metadata(self, folder_id: str) -> Optional[QuipItem]:
         """
         Get metadata for a specific folder.
         
+        Deprecated: the folder's title arrives with its contents, so use
+        ``FolderContents.folder_name`` from ``get_folder_contents`` (or the
+        ``root_folder`` of a traversed hierarchy) instead of a separate lookup.
+        
         Args:
             folder_id: ID of the folder
             
         Returns:
             QuipItem with folder metadata, or None if not accessible
         """
+        warnings.warn(
+            "get_folder_metadata() is deprecated; use FolderContents.folder_name from get_folder_contents()",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        
         try:
             # Note: The current Quip API doesn't have a direct folder metadata endpoint
             # We get folder names from the parent folder's children list
@@ -156,7 +310,7 @@ class FolderTraverser:
                 id=folder_id,
                 name=f"Folder {folder_id}",
                 type="folder",
-                url=f"https://quip-amazon.com/folder/{folder_id}"
+                url=f"{QUIP_URL_PREFIX}folder/{folder_id}"
             )
         except QuipAPIError as e:
             logger.warning(f"Could not get metadata for folder {folder_id}: {str(e)}")
@@ -175,22 +329,29 @@ class FolderTraverser:
         """
         documents = []
         
-        # Current folder path
-        current_path = f"{base_path}/{hierarchy.root_folder.name}".strip("/")
+        # Iterative pre-order walk carrying each folder's path; paths are
+        # built once per folder and shared by all of its documents. Only the
+        # root can pick up a stray slash from an empty base path.
+        stack = [(hierarchy, f"{base_path}/{hierarchy.root_folder.name}".strip("/"))]
         
-        # Add documents from this folder
-        for doc in hierarchy.documents:
-            doc_info = DocumentInfo(
-                item=doc,
-                relative_path=current_path,
-                local_file_path=""  # Will be set by FileSystemManager
+        while stack:
+            current, current_path = stack.pop()
+            
+            # Add documents from this folder
+            documents.extend(
+                DocumentInfo(
+                    item=doc,
+                    relative_path=current_path,
+                    local_file_path=""  # Will be set by FileSystemManager
+                )
+                for doc in current.documents
+            )
+            
+            # Reversed so subfolders are visited in insertion order
+            stack.extend(
+                (subfolder, f"{current_path}/{subfolder.root_folder.name}")
+                for subfolder in reversed(list(current.subfolders.values()))
             )
-            documents.append(doc_info)
-        
-        # Recursively add documents from subfolders
-        for subfolder_hierarchy in hierarchy.subfolders.values():
-            subfolder_docs = self.build_document_list(subfolder_hierarchy, current_path)
-            documents.extend(subfolder_docs)
         
         return documents
     
@@ -204,75 +365,65 @@ class FolderTraverser:
         Returns:
             Dictionary with traversal statistics
         """
+        hierarchy_stats = hierarchy.get_stats()
+        
         stats = {
-            "total_folders": hierarchy.total_folders,
-            "total_documents": hierarchy.total_documents,
-            "max_depth": self._calculate_max_depth(hierarchy),
-            "empty_folders": self._count_empty_folders(hierarchy)
+            "total_folders": hierarchy_stats.total_folders,
+            "total_documents": hierarchy_stats.total_documents,
+            "max_depth": hierarchy_stats.max_depth,
+            "empty_folders": hierarchy_stats.empty_folders
         }
         
         return stats
     
-    def _calculate_max_depth(self, hierarchy: FolderHierarchy, current_depth: int = 0) -> int:
-        """Calculate the maximum depth of the folder hierarchy."""
-        if not hierarchy.subfolders:
-            return current_depth
-        
-        max_subfolder_depth = 0
-        for subfolder in hierarchy.subfolders.values():
-            subfolder_depth = self._calculate_max_depth(subfolder, current_depth + 1)
-            max_subfolder_depth = max(max_subfolder_depth, subfolder_depth)
-        
-        return max_subfolder_depth
-    
-    def _count_empty_folders(self, hierarchy: FolderHierarchy) -> int:
-        """Count the number of empty folders in the hierarchy."""
-        count = 0
-        
-        # Check if this folder is empty (no documents and no subfolders)
-        if not hierarchy.documents and not hierarchy.subfolders:
-            count += 1
-        
-        # Recursively count empty subfolders
-        for subfolder in hierarchy.subfolders.values():
-            count += self._count_empty_folders(subfolder)
-        
-        return count
-    
     def validate_hierarchy(self, hierarchy: FolderHierarchy) -> List[str]:
         """
         Validate the folder hierarchy for potential issues.
         
+        The result is cached on the hierarchy until its statistics are
+        recomputed, so repeated calls don't walk the tree again.
+        
         Args:
             hierarchy: FolderHierarchy to validate
             
         Returns:
             List of validation warnings/errors
         """
+        return hierarchy.get_validation_issues(self._find_issues)
+    
+    def _find_issues(self, hierarchy: FolderHierarchy) -> List[str]:
+        """Walk the hierarchy and collect validation issues."""
         issues = []
+        stats = hierarchy.get_stats()
         
         # Check for empty hierarchy
-        if hierarchy.total_documents == 0 and hierarchy.total_folders == 1:
+        if stats.total_documents == 0 and stats.total_folders == 1:
             issues.append("Hierarchy appears to be empty (no documents found)")
         
         # Check for very deep hierarchies
-        max_depth = self._calculate_max_depth(hierarchy)
-        if max_depth > 20:
-            issues.append(f"Very deep folder hierarchy detected (depth: {max_depth})")
+        if stats.max_depth > 20:
+            issues.append(f"Very deep folder hierarchy detected (depth: {stats.max_depth})")
         
         # Check for folders with many items (potential performance issues)
         self._check_large_folders(hierarchy, issues)
         
         return issues
     
-    def _check_large_folders(self, hierarchy: FolderHierarchy, issues: List[str], path: str = "") -> None:
+    def _check_large_folders(self, hierarchy: FolderHierarchy, issues: List[str]) -> None:
         """Check for folders with unusually large numbers of items."""
-        current_path = f"{path}/{hierarchy.root_folder.name}".strip("/")
-        total_items = len(hierarchy.documents) + len(hierarchy.subfolders)
-        
-        if total_items > 100:
-            issues.append(f"Large folder detected: '{current_path}' has {total_items} items")
+        # Explicit stack of (node, folder names from the root) so deep trees can't
+        # hit the recursion limit; the path string is only built for large folders
+        stack: List[Tuple[FolderHierarchy, Tuple[str, ...]]] = [(hierarchy, (hierarchy.root_folder.name,))]
         
-        # Recursively check subfolders
-        for subfolder in hierarchy.subfolders.values():
-            self._check_large_folders(subfolder, issues, current_path)
\ No newline at end of file
+        while stack:
+            current, parts = stack.pop()
+            total_items = len(current.documents) + len(current.subfolders)
+            
+            if total_items > 100:
+                issues.append(f"Large folder detected: '{'/'.join(parts)}' has {total_items} items")
+            
+            # Push in reverse so folders are checked in listing order
+            stack.extend(
+                (subfolder, parts + (subfolder.root_folder.name,))
+                for subfolder in reversed(list(current.subfolders.values()))
+            )
\ No newline at end of file
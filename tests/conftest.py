@@ -5,34 +5,74 @@ This module contains common fixtures and configuration used across all tests.
 """
 
 import pytest
-import tempfile
-import shutil
+import responses
 from pathlib import Path
 from typing import Dict, Any
 from unittest.mock import Mock
 
 from quip_mirror.models import MirrorConfig, QuipItem, FolderContents, ProcessingSummary
+from quip_mirror.quip_client import QuipAPIClient
 
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for testing."""
-    temp_path = tempfile.mkdtemp()
-    yield temp_path
-    shutil.rmtree(temp_path)
+def temp_dir(tmp_path):
+    """Path of a temporary directory for testing, as a string; cleaned up by pytest."""
+    return str(tmp_path)
 
 
 @pytest.fixture
-def sample_config(temp_dir):
+def sample_config(tmp_path):
     """Create a sample MirrorConfig for testing."""
     return MirrorConfig(
         quip_folder_url="https://quip-amazon.com/folder/test123",
-        target_path=temp_dir,
+        target_path=str(tmp_path),
         access_token="test_token",
         overwrite_existing=True
     )
 
 
+@pytest.fixture
+def mocked_responses():
+    """Intercept HTTP requests made through requests for the duration of a test."""
+    # Like @responses.activate, don't fail tests over registered but unused responses
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        yield rsps
+
+
+@pytest.fixture
+def base_mocks(mocked_responses, mock_quip_api_response, quip_client):
+    """
+    Register successful responses for the endpoints most client tests call.
+    
+    Tests that need an error use ``base_mocks.replace(...)`` on the same URL.
+    """
+    mocked_responses.add(
+        responses.GET,
+        f"{quip_client.base_url}/users/current",
+        json={"user": {"id": "user123"}},
+        status=200
+    )
+    mocked_responses.add(
+        responses.GET,
+        f"{quip_client.base_url}/folders/folder123",
+        json=mock_quip_api_response,
+        status=200
+    )
+    return mocked_responses
+
+
+@pytest.fixture(scope="session")
+def quip_client():
+    """QuipAPIClient shared by every test that doesn't need special settings."""
+    return QuipAPIClient("test_token")
+
+
+@pytest.fixture(scope="session")
+def quip_client_no_retries():
+    """Shared QuipAPIClient with HTTP retries disabled."""
+    return QuipAPIClient("test_token", max_retries=0)
+
+
 @pytest.fixture
 def sample_folder_item():
     """Create a sample folder QuipItem."""
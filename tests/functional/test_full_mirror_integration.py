@@ -21,13 +21,9 @@ class TestFullMirrorIntegration:
     """Integration tests for complete folder mirroring workflow."""
     
     @pytest.fixture
-    def temp_target_dir(self):
-        """Create a temporary directory for test output."""
-        temp_dir = tempfile.mkdtemp(prefix="quip_mirror_test_")
-        yield temp_dir
-        # Cleanup after test
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
+    def temp_target_dir(self, tmp_path):
+        """Create a temporary directory for test output; cleaned up by pytest."""
+        return str(tmp_path)
     
     @pytest.fixture
     def mock_token(self):
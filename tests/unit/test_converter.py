@@ -0,0 +1,242 @@
+"""
+Unit tests for the document converter.
+"""
+
+import threading
+import pytest
+from unittest.mock import Mock, patch
+from quip_mirror.converter import DocumentConverter
+from quip_mirror.filesystem import FileSystemManager
+from quip_mirror.models import DocumentContent, DocumentInfo, QuipItem
+from quip_mirror.quip_client import QuipAPIError
+
+
+class TestExportRetry:
+    """Test cases for retrying transient export failures."""
+    
+    def test_retries_transient_errors(self):
+        """Test that rate-limit and gateway errors are retried."""
+        client = Mock()
+        client.export_document_to_docx.side_effect = [
+            QuipAPIError("Rate limited", 429),
+            QuipAPIError("Timeout while exporting document doc123"),
+            True
+        ]
+        converter = DocumentConverter(client, Mock())
+        
+        with patch("quip_mirror.converter.time.sleep") as mock_sleep:
+            assert converter._export_with_retry("doc123", "out.docx") is True
+        
+        assert client.export_document_to_docx.call_count == 3
+        assert mock_sleep.call_count == 2
+    
+    def test_does_not_retry_permanent_errors(self):
+        """Test that non-transient errors fail immediately."""
+        client = Mock()
+        client.export_document_to_docx.side_effect = QuipAPIError("Document doc123 not found.", 404)
+        converter = DocumentConverter(client, Mock())
+        
+        with patch("quip_mirror.converter.time.sleep") as mock_sleep:
+            with pytest.raises(QuipAPIError, match="not found"):
+                converter._export_with_retry("doc123", "out.docx")
+        
+        assert client.export_document_to_docx.call_count == 1
+        mock_sleep.assert_not_called()
+    
+    def test_gives_up_after_max_attempts(self):
+        """Test that persistent transient errors are eventually raised."""
+        client = Mock()
+        client.export_document_to_docx.side_effect = QuipAPIError("Service unavailable", 503)
+        converter = DocumentConverter(client, Mock())
+        
+        with patch("quip_mirror.converter.time.sleep"):
+            with pytest.raises(QuipAPIError):
+                converter._export_with_retry("doc123", "out.docx")
+        
+        assert client.export_document_to_docx.call_count == DocumentConverter.EXPORT_ATTEMPTS
+
+
+class TestMetadataLookup:
+    """Test cases for document metadata lookups during export."""
+    
+    def test_export_without_manifest_skips_metadata(self, temp_dir, sample_document_item):
+        """Test that no metadata request is made when changes aren't tracked."""
+        client = Mock()
+        client.export_document_to_docx.side_effect = self._write_docx
+        converter = DocumentConverter(client, FileSystemManager(temp_dir))
+        doc_info = DocumentInfo(item=sample_document_item, relative_path="Root", local_file_path="")
+        
+        success, _ = converter.export_to_word(doc_info)
+        
+        assert success is True
+        client.get_document_metadata.assert_not_called()
+    
+    def test_manifest_skips_unchanged_document(self, temp_dir, sample_document_item):
+        """Test that a document not updated since its last export is skipped."""
+        client = Mock()
+        client.export_document_to_docx.side_effect = self._write_docx
+        client.get_document_metadata.return_value = DocumentContent(
+            title="Test Document", content="", format="quip", updated_usec=42
+        )
+        converter = DocumentConverter(client, FileSystemManager(temp_dir), manifest={})
+        doc_info = DocumentInfo(item=sample_document_item, relative_path="Root", local_file_path="")
+        
+        # A document without a manifest entry can't be skipped, so needs no metadata
+        success, _ = converter.export_to_word(doc_info)
+        assert success is True
+        assert converter.manifest["doc123"] > 42
+        client.get_document_metadata.assert_not_called()
+        
+        success, message = converter.export_to_word(doc_info)
+        assert success is False
+        assert "Skipped unchanged" in message
+        assert client.export_document_to_docx.call_count == 1
+        assert client.get_document_metadata.call_count == 1
+    
+    def test_manifest_reexports_updated_document(self, temp_dir, sample_document_item):
+        """Test that a document updated since its last export is exported again."""
+        client = Mock()
+        client.export_document_to_docx.side_effect = self._write_docx
+        client.get_document_metadata.return_value = DocumentContent(
+            title="Test Document", content="", format="quip", updated_usec=42
+        )
+        manager = FileSystemManager(temp_dir)
+        doc_info = DocumentInfo(item=sample_document_item, relative_path="Root", local_file_path="")
+        manager.ensure_directory_exists(f"{temp_dir}/Root")
+        self._write_docx("doc123", manager.get_document_path(doc_info))
+        converter = DocumentConverter(client, manager, manifest={"doc123": 10})
+        
+        success, _ = converter.export_to_word(doc_info)
+        
+        assert success is True
+        assert converter.manifest == {"doc123": 42}
+    
+    @staticmethod
+    def _write_docx(thread_id, file_path):
+        with open(file_path, "wb") as f:
+            f.write(b"PK mock docx")
+        return True
+
+
+class TestConcurrentExport:
+    """Test cases for exporting documents concurrently."""
+    
+    def test_same_named_documents_get_separate_files(self, tmp_path):
+        """Test that same-named documents in one folder don't clobber each other."""
+        both_started = threading.Barrier(2, timeout=5)
+        
+        def export(thread_id, file_path):
+            # Make both downloads overlap
+            both_started.wait()
+            with open(file_path, "wb") as f:
+                f.write(f"PK {thread_id}".encode())
+            return True
+        
+        client = Mock()
+        client.export_document_to_docx.side_effect = export
+        documents = [
+            DocumentInfo(
+                item=QuipItem(id=doc_id, name="Meeting Notes", type="document", url=f"https://quip-amazon.com/{doc_id}"),
+                relative_path="Root",
+                local_file_path=""
+            )
+            for doc_id in ("doc1", "doc2")
+        ]
+        
+        with DocumentConverter(client, FileSystemManager(str(tmp_path)), max_workers=2) as converter:
+            results = converter.batch_export(documents)
+        
+        assert len(results["successful"]) == 2
+        contents = sorted(path.read_bytes() for path in (tmp_path / "Root").iterdir())
+        assert contents == [b"PK doc1", b"PK doc2"]
+    
+    def test_same_named_documents_are_numbered_in_listing_order(self, tmp_path):
+        """Test that suffixes follow listing order, not export completion order."""
+        def export(thread_id, file_path):
+            with open(file_path, "wb") as f:
+                f.write(f"PK {thread_id}".encode())
+            return True
+        
+        client = Mock()
+        client.export_document_to_docx.side_effect = export
+        documents = [
+            DocumentInfo(
+                item=QuipItem(id=doc_id, name="Meeting Notes", type="document", url=f"https://quip-amazon.com/{doc_id}"),
+                relative_path="Root",
+                local_file_path=""
+            )
+            for doc_id in ("doc1", "doc2")
+        ]
+        
+        with DocumentConverter(client, FileSystemManager(str(tmp_path)), max_workers=2) as converter:
+            second_done = threading.Event()
+            export_to_word = converter.export_to_word
+            
+            def delayed_export(doc_info, output_path=None):
+                # Let the second document's export run to completion first
+                if doc_info.item.id == "doc1":
+                    second_done.wait(timeout=5)
+                try:
+                    return export_to_word(doc_info, output_path)
+                finally:
+                    if doc_info.item.id == "doc2":
+                        second_done.set()
+            
+            converter.export_to_word = delayed_export
+            converter.stream_export(iter(documents))
+        
+        assert (tmp_path / "Root" / "Meeting-Notes.docx").read_bytes() == b"PK doc1"
+        assert (tmp_path / "Root" / "Meeting-Notes-2.docx").read_bytes() == b"PK doc2"
+
+
+class TestBatchProgress:
+    """Test cases for progress reporting during batch export."""
+    
+    def test_progress_callbacks_are_debounced(self, sample_document_item):
+        """Test that rapid progress updates are coalesced but the last item is reported."""
+        converter = DocumentConverter(Mock(), Mock(), max_workers=1)
+        converter.export_one = Mock(return_value=("successful", {}))
+        documents = [DocumentInfo(item=sample_document_item, relative_path="Root", local_file_path="Root/Test-Document.docx")] * 5
+        callback = Mock()
+        
+        with patch("quip_mirror.converter.time.monotonic", return_value=100.0):
+            converter.batch_export(documents, callback)
+        
+        assert [c.args[0] for c in callback.call_args_list] == [1, 5]
+
+
+class TestSharedExecutor:
+    """Test cases for the converter's shared thread pool."""
+    
+    def test_executor_reused_until_closed(self):
+        """Test that one pool serves every batch until the converter is closed."""
+        with DocumentConverter(Mock(), Mock(), max_workers=2) as converter:
+            executor = converter._get_executor()
+            assert converter._get_executor() is executor
+        
+        assert converter._executor is None
+        assert converter._get_executor() is not executor
+        converter.close()
+
+
+class TestStreamExport:
+    """Test cases for exporting documents while they are being discovered."""
+    
+    def test_exports_every_streamed_document(self, sample_document_item):
+        """Test that documents from a generator are exported and given paths."""
+        filesystem_manager = Mock()
+        filesystem_manager.get_document_path.return_value = "/mirror/Root/Test Document.docx"
+        callback = Mock()
+        
+        def discover():
+            for _ in range(3):
+                yield DocumentInfo(item=sample_document_item, relative_path="Root", local_file_path="")
+        
+        with DocumentConverter(Mock(), filesystem_manager, max_workers=2) as converter:
+            converter.export_one = Mock(return_value=("successful", {}))
+            results = converter.stream_export(discover(), callback)
+        
+        assert results["total"] == 3
+        assert len(results["successful"]) == 3
+        assert converter.export_one.call_args.args[0].local_file_path == "/mirror/Root/Test Document.docx"
+        assert callback.call_args.args[:2] == (3, 3)
@@ -0,0 +1,98 @@
+"""
+Unit tests for the file system manager.
+"""
+
+import json
+from pathlib import Path
+
+from quip_mirror.filesystem import FileSystemManager
+from quip_mirror.models import DocumentInfo, FolderHierarchy, QuipItem
+
+
+class TestManifest:
+    """Test cases for the export manifest."""
+    
+    def test_load_missing_manifest(self, temp_dir):
+        """Test that a missing manifest loads as empty."""
+        manager = FileSystemManager(temp_dir)
+        
+        assert manager.load_manifest() == {}
+    
+    def test_manifest_round_trip(self, temp_dir):
+        """Test saving and reloading a manifest."""
+        manager = FileSystemManager(temp_dir)
+        
+        manager.save_manifest({"doc123": 1700000000000000, "doc456": 1700000000000001})
+        
+        assert manager.load_manifest() == {"doc123": 1700000000000000, "doc456": 1700000000000001}
+        assert not (Path(temp_dir) / (FileSystemManager.MANIFEST_FILENAME + ".tmp")).exists()
+    
+    def test_load_corrupt_manifest(self, temp_dir):
+        """Test that an unreadable manifest is ignored."""
+        manager = FileSystemManager(temp_dir)
+        (Path(temp_dir) / FileSystemManager.MANIFEST_FILENAME).write_text("{not json")
+        
+        assert manager.load_manifest() == {}
+    
+    def test_load_non_dict_manifest(self, temp_dir):
+        """Test that a manifest with the wrong shape is ignored."""
+        manager = FileSystemManager(temp_dir)
+        (Path(temp_dir) / FileSystemManager.MANIFEST_FILENAME).write_text(json.dumps([1, 2, 3]))
+        
+        assert manager.load_manifest() == {}
+
+
+class TestDocumentPaths:
+    """Test cases for document path resolution."""
+    
+    def test_get_document_path_sanitizes_shared_folders(self, temp_dir):
+        """Test that documents in the same folder resolve to one sanitized directory."""
+        manager = FileSystemManager(temp_dir)
+        documents = [
+            DocumentInfo(
+                item=QuipItem(id=f"doc{i}", name=f"Doc {i}", type="document", url=f"https://quip-amazon.com/doc{i}"),
+                relative_path=path,
+                local_file_path=""
+            )
+            for i, path in enumerate(["Root", "Root/Sub Folder", "Root/Sub Folder", "Root"])
+        ]
+        
+        paths = [manager.get_document_path(doc_info) for doc_info in documents]
+        
+        assert paths[1] == str(Path(temp_dir) / "Root" / "Sub-Folder" / "Doc-1.docx")
+        assert paths[2] == str(Path(temp_dir) / "Root" / "Sub-Folder" / "Doc-2.docx")
+        assert paths[3] == str(Path(temp_dir) / "Root" / "Doc-3.docx")
+        assert set(manager._path_cache) == {"Root", "Root/Sub Folder"}
+    
+    def test_temp_file_has_regular_file_permissions(self, temp_dir):
+        """Test that temp files are unique and get the same mode as a regular file."""
+        manager = FileSystemManager(temp_dir)
+        target = Path(temp_dir) / "Doc.docx"
+        regular = Path(temp_dir) / "regular.docx"
+        regular.write_bytes(b"")
+        
+        first = manager.create_temp_file(str(target))
+        second = manager.create_temp_file(str(target))
+        
+        assert first != second
+        assert Path(first).stat().st_mode == regular.stat().st_mode
+
+
+class TestDirectoryStructure:
+    """Test cases for directory structure creation."""
+    
+    def test_create_nested_structure(self, temp_dir):
+        """Test that every folder in the hierarchy gets a directory."""
+        def folder(folder_id, name):
+            return QuipItem(id=folder_id, name=name, type="folder", url=f"https://quip-amazon.com/folder/{folder_id}")
+        
+        leaf = FolderHierarchy(root_folder=folder("leaf", "Leaf Folder"))
+        child = FolderHierarchy(root_folder=folder("child", "Child"), subfolders={"leaf": leaf})
+        sibling = FolderHierarchy(root_folder=folder("sibling", "Sibling"))
+        root = FolderHierarchy(root_folder=folder("root", "Root"), subfolders={"child": child, "sibling": sibling})
+        
+        manager = FileSystemManager(temp_dir)
+        assert manager.create_directory_structure(root) is True
+        
+        assert (Path(temp_dir) / "Root" / "Child" / "Leaf-Folder").is_dir()
+        assert (Path(temp_dir) / "Root" / "Sibling").is_dir()
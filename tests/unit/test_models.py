@@ -3,9 +3,10 @@ Unit tests for the models module.
 """
 
 import pytest
+from pathlib import Path
 from quip_mirror.models import (
     MirrorConfig, QuipItem, FolderContents, FolderHierarchy,
-    DocumentInfo, DocumentContent, ProcessingSummary
+    DocumentInfo, DocumentContent, ProcessingSummary, ConversionStats
 )
 
 
@@ -21,93 +22,54 @@ class TestMirrorConfig:
         )
         
         assert config.quip_folder_url == "https://quip-amazon.com/folder/test123"
-        assert config.target_path == temp_dir
+        assert config.target_path == Path(temp_dir)
         assert config.access_token == "test_token"
         assert config.overwrite_existing is True
     
-    def test_invalid_url(self, temp_dir):
-        """Test configuration with invalid URL."""
-        with pytest.raises(ValueError, match="Quip URL must start with"):
+    @pytest.mark.parametrize("url,target_path,match", [
+        ("https://invalid.com/folder/test123", None, "Quip URL must start with"),
+        ("", None, "Quip folder URL is required"),
+        ("https://quip-amazon.com/folder/test123", "", "Target path is required"),
+    ], ids=["invalid_url", "empty_url", "empty_target_path"])
+    def test_invalid_config(self, temp_dir, url, target_path, match):
+        """Test configuration with an invalid URL or target path (None means a valid temp dir)."""
+        with pytest.raises(ValueError, match=match):
             MirrorConfig(
-                quip_folder_url="https://invalid.com/folder/test123",
-                target_path=temp_dir
-            )
-    
-    def test_empty_url(self, temp_dir):
-        """Test configuration with empty URL."""
-        with pytest.raises(ValueError, match="Quip folder URL is required"):
-            MirrorConfig(
-                quip_folder_url="",
-                target_path=temp_dir
-            )
-    
-    def test_empty_target_path(self):
-        """Test configuration with empty target path."""
-        with pytest.raises(ValueError, match="Target path is required"):
-            MirrorConfig(
-                quip_folder_url="https://quip-amazon.com/folder/test123",
-                target_path=""
+                quip_folder_url=url,
+                target_path=temp_dir if target_path is None else target_path
             )
 
 
 class TestQuipItem:
     """Test cases for QuipItem."""
     
-    def test_valid_folder_item(self):
-        """Test creating a valid folder item."""
-        item = QuipItem(
-            id="folder123",
-            name="Test Folder",
-            type="folder",
-            url="https://quip-amazon.com/folder/folder123"
-        )
-        
-        assert item.id == "folder123"
-        assert item.name == "Test Folder"
-        assert item.type == "folder"
-        assert item.url == "https://quip-amazon.com/folder/folder123"
-    
-    def test_valid_document_item(self):
-        """Test creating a valid document item."""
+    @pytest.mark.parametrize("item_type", ["folder", "document"])
+    def test_valid_item(self, item_type):
+        """Test creating a valid folder or document item."""
         item = QuipItem(
-            id="doc123",
-            name="Test Document",
-            type="document",
-            url="https://quip-amazon.com/doc/doc123"
+            id=f"{item_type}123",
+            name=f"Test {item_type.title()}",
+            type=item_type,
+            url=f"https://quip-amazon.com/{item_type}/{item_type}123"
         )
         
-        assert item.id == "doc123"
-        assert item.name == "Test Document"
-        assert item.type == "document"
-        assert item.url == "https://quip-amazon.com/doc/doc123"
-    
-    def test_invalid_type(self):
-        """Test creating item with invalid type."""
-        with pytest.raises(ValueError, match="Invalid type"):
-            QuipItem(
-                id="test123",
-                name="Test Item",
-                type="invalid",
-                url="https://quip-amazon.com/test123"
-            )
-    
-    def test_empty_id(self):
-        """Test creating item with empty ID."""
-        with pytest.raises(ValueError, match="Item ID is required"):
-            QuipItem(
-                id="",
-                name="Test Item",
-                type="folder",
-                url="https://quip-amazon.com/test123"
-            )
+        assert item.id == f"{item_type}123"
+        assert item.name == f"Test {item_type.title()}"
+        assert item.type == item_type
+        assert item.url == f"https://quip-amazon.com/{item_type}/{item_type}123"
     
-    def test_empty_name(self):
-        """Test creating item with empty name."""
-        with pytest.raises(ValueError, match="Item name is required"):
+    @pytest.mark.parametrize("item_id,name,item_type,match", [
+        ("test123", "Test Item", "invalid", "Invalid type"),
+        ("", "Test Item", "folder", "Item ID is required"),
+        ("test123", "", "folder", "Item name is required"),
+    ], ids=["invalid_type", "empty_id", "empty_name"])
+    def test_invalid_item(self, item_id, name, item_type, match):
+        """Test creating an item with an invalid type, ID or name."""
+        with pytest.raises(ValueError, match=match):
             QuipItem(
-                id="test123",
-                name="",
-                type="folder",
+                id=item_id,
+                name=name,
+                type=item_type,
                 url="https://quip-amazon.com/test123"
             )
 
@@ -155,23 +117,19 @@ class TestFolderHierarchy:
     
     def test_nested_hierarchy(self, sample_folder_item, sample_document_item):
         """Test nested folder hierarchy."""
-        # Create subfolder hierarchy
-        subfolder_item = QuipItem(
-            id="subfolder123",
-            name="Sub Folder",
-            type="folder",
-            url="https://quip-amazon.com/folder/subfolder123"
-        )
-        
-        subfolder_hierarchy = FolderHierarchy(
-            root_folder=subfolder_item,
-            documents=[sample_document_item]
-        )
-        
-        # Create main hierarchy
         hierarchy = FolderHierarchy(
             root_folder=sample_folder_item,
-            subfolders={"subfolder123": subfolder_hierarchy}
+            subfolders={
+                "subfolder123": FolderHierarchy(
+                    root_folder=QuipItem(
+                        id="subfolder123",
+                        name="Sub Folder",
+                        type="folder",
+                        url="https://quip-amazon.com/folder/subfolder123"
+                    ),
+                    documents=[sample_document_item]
+                )
+            }
         )
         
         assert hierarchy.total_folders == 2  # Root + subfolder
@@ -181,6 +139,18 @@ class TestFolderHierarchy:
         all_docs = hierarchy.get_all_documents()
         assert len(all_docs) == 1
         assert all_docs[0].item == sample_document_item
+    
+    def test_compute_stats_refreshes_cached_totals(self, sample_folder_item, sample_document_item):
+        """Test that totals are cached until compute_stats is called again."""
+        hierarchy = FolderHierarchy(root_folder=sample_folder_item)
+        assert hierarchy.total_documents == 0
+        
+        hierarchy.documents.append(sample_document_item)
+        assert hierarchy.total_documents == 0  # Still cached
+        
+        stats = hierarchy.compute_stats()
+        assert (stats.total_folders, stats.total_documents) == (1, 1)
+        assert hierarchy.total_documents == 1
 
 
 class TestDocumentInfo:
@@ -232,15 +202,7 @@ class TestDocumentContent:
         )
         
         sanitized = content.sanitize_title_for_filename()
-        assert "/" not in sanitized
-        assert "<" not in sanitized
-        assert ">" not in sanitized
-        assert ":" not in sanitized
-        assert "\"" not in sanitized
-        assert "\\" not in sanitized
-        assert "|" not in sanitized
-        assert "?" not in sanitized
-        assert "*" not in sanitized
+        assert not set(sanitized) & set("/<>:\"\\|?*")
     
     def test_sanitize_empty_title(self):
         """Test sanitizing empty title."""
@@ -308,9 +270,27 @@ class TestProcessingSummary:
         )
         
         str_repr = str(summary)
-        assert "Total folders: 2" in str_repr
-        assert "Total documents: 5" in str_repr
-        assert "Successful conversions: 4" in str_repr
-        assert "Failed conversions: 1" in str_repr
-        assert "Success rate: 80.0%" in str_repr
-        assert "Errors: 1" in str_repr
\ No newline at end of file
+        expected = (
+            "Total folders: 2",
+            "Total documents: 5",
+            "Successful conversions: 4",
+            "Failed conversions: 1",
+            "Success rate: 80.0%",
+            "Errors: 1",
+        )
+        assert [line for line in expected if line not in str_repr] == []
+
+
+class TestConversionStats:
+    """Test cases for ConversionStats."""
+    
+    def test_total_and_success_rate(self):
+        """Test derived totals on conversion statistics."""
+        stats = ConversionStats()
+        assert stats.total == 0
+        assert stats.success_rate == 0.0
+        
+        stats.successful = 3
+        stats.failed = 1
+        assert stats.total == 4
+        assert stats.success_rate == 75.0
\ No newline at end of file
@@ -4,8 +4,8 @@ Unit tests for the Quip API client.
 
 import pytest
 import responses
-from unittest.mock import Mock, patch
-from quip_mirror.quip_client import QuipAPIClient, QuipAPIError
+from collections import OrderedDict
+from quip_mirror.quip_client import FolderCache, QuipAPIClient, QuipAPIError, RateLimiter
 from quip_mirror.models import FolderContents, DocumentContent
 
 
@@ -17,73 +17,54 @@ class TestQuipAPIClient:
         client = QuipAPIClient("test_token")
         
         assert client.access_token == "test_token"
-        assert client.base_url == "https://platform.quip.com/1"
+        assert client.base_url == "https://platform.quip-amazon.com/1"
         assert client.timeout == 30
-        assert "Bearer test_token" in client.session.headers["Authorization"]
+        assert client.session.headers["Authorization"] == "Bearer test_token"
     
-    def test_extract_folder_id_from_url(self):
-        """Test folder ID extraction from various URL formats."""
+    def test_clients_share_session(self):
+        """Test that clients with the same token and settings reuse one session."""
         client = QuipAPIClient("test_token")
         
-        # Standard folder URL
-        folder_id = client.extract_folder_id_from_url("https://quip-amazon.com/folder/ABC123")
-        assert folder_id == "ABC123"
-        
-        # Direct folder ID URL
-        folder_id = client.extract_folder_id_from_url("https://quip-amazon.com/ABC123")
-        assert folder_id == "ABC123"
-        
-        # Folder URL with additional path
-        folder_id = client.extract_folder_id_from_url("https://quip-amazon.com/folder/ABC123/folder-name")
-        assert folder_id == "ABC123"
+        assert QuipAPIClient("test_token").session is client.session
+        assert QuipAPIClient("other_token").session is not client.session
+        assert QuipAPIClient("test_token", max_retries=5).session is not client.session
     
-    def test_extract_folder_id_invalid_url(self):
-        """Test folder ID extraction with invalid URLs."""
-        client = QuipAPIClient("test_token")
+    def test_session_cache_is_bounded_and_hashed(self, monkeypatch):
+        """Test that the session cache holds no plaintext tokens and evicts old sessions."""
+        # Use a private cache so the shared client fixtures keep their sessions
+        monkeypatch.setattr(QuipAPIClient, "_session_cache", OrderedDict())
         
-        # Invalid domain
-        with pytest.raises(QuipAPIError, match="Invalid Quip URL"):
-            client.extract_folder_id_from_url("https://invalid.com/folder/ABC123")
+        for i in range(QuipAPIClient.MAX_CACHED_SESSIONS + 2):
+            QuipAPIClient(f"token_{i}")
         
-        # Empty path
-        with pytest.raises(QuipAPIError, match="Cannot extract folder ID"):
-            client.extract_folder_id_from_url("https://quip-amazon.com/")
+        assert len(QuipAPIClient._session_cache) == QuipAPIClient.MAX_CACHED_SESSIONS
+        assert all(not key[0].startswith("token_") for key in QuipAPIClient._session_cache)
         
-        # Invalid folder ID format
-        with pytest.raises(QuipAPIError, match="Invalid folder ID format"):
-            client.extract_folder_id_from_url("https://quip-amazon.com/folder/ABC-123!")
+        QuipAPIClient.close_sessions()
+        assert not QuipAPIClient._session_cache
+    
+    @pytest.mark.parametrize("url,expected", [
+        ("https://quip-amazon.com/folder/ABC123", "ABC123"),
+        ("https://quip-amazon.com/ABC123", "ABC123"),
+        ("https://quip-amazon.com/folder/ABC123/folder-name", "ABC123"),
+    ], ids=["folder_url", "direct_id", "extra_path"])
+    def test_extract_folder_id_from_url(self, quip_client, url, expected):
+        """Test folder ID extraction from various URL formats."""
+        assert quip_client.extract_folder_id_from_url(url) == expected
+    
+    @pytest.mark.parametrize("url,match", [
+        ("https://invalid.com/folder/ABC123", "Invalid Quip URL"),
+        ("https://quip-amazon.com/", "Cannot extract folder ID"),
+        ("https://quip-amazon.com/folder/ABC-123!", "Invalid folder ID format"),
+    ], ids=["invalid_domain", "empty_path", "invalid_id"])
+    def test_extract_folder_id_invalid_url(self, quip_client, url, match):
+        """Test folder ID extraction with invalid URLs."""
+        with pytest.raises(QuipAPIError, match=match):
+            quip_client.extract_folder_id_from_url(url)
     
-    @responses.activate
-    def test_get_folder_contents_success(self):
+    def test_get_folder_contents_success(self, base_mocks, quip_client):
         """Test successful folder contents retrieval."""
-        client = QuipAPIClient("test_token")
-        
-        # Mock API response
-        mock_response = {
-            "folder": {
-                "id": "folder123",
-                "title": "Test Folder"
-            },
-            "children": [
-                {
-                    "folder_id": "subfolder123",
-                    "title": "Sub Folder"
-                },
-                {
-                    "thread_id": "doc123",
-                    "title": "Test Document"
-                }
-            ]
-        }
-        
-        responses.add(
-            responses.GET,
-            "https://platform.quip.com/1/folders/folder123",
-            json=mock_response,
-            status=200
-        )
-        
-        contents = client.get_folder_contents("folder123")
+        contents = quip_client.get_folder_contents("folder123")
         
         assert isinstance(contents, FolderContents)
         assert len(contents.folders) == 1
@@ -93,41 +74,32 @@ class TestQuipAPIClient:
         assert contents.documents[0].id == "doc123"
         assert contents.documents[0].name == "Test Document"
     
-    @responses.activate
-    def test_get_folder_contents_auth_error(self):
+    def test_get_folder_contents_auth_error(self, base_mocks, quip_client):
         """Test folder contents retrieval with authentication error."""
-        client = QuipAPIClient("test_token")
-        
-        responses.add(
+        base_mocks.replace(
             responses.GET,
-            "https://platform.quip.com/1/folders/folder123",
+            f"{quip_client.base_url}/folders/folder123",
             json={"error": "Unauthorized"},
             status=401
         )
         
         with pytest.raises(QuipAPIError, match="Authentication failed"):
-            client.get_folder_contents("folder123")
+            quip_client.get_folder_contents("folder123")
     
-    @responses.activate
-    def test_get_folder_contents_not_found(self):
+    def test_get_folder_contents_not_found(self, base_mocks, quip_client):
         """Test folder contents retrieval with not found error."""
-        client = QuipAPIClient("test_token")
-        
-        responses.add(
+        base_mocks.replace(
             responses.GET,
-            "https://platform.quip.com/1/folders/folder123",
+            f"{quip_client.base_url}/folders/folder123",
             json={"error": "Not found"},
             status=404
         )
         
         with pytest.raises(QuipAPIError, match="Folder folder123 not found"):
-            client.get_folder_contents("folder123")
+            quip_client.get_folder_contents("folder123")
     
-    @responses.activate
-    def test_get_document_metadata_success(self):
+    def test_get_document_metadata_success(self, mocked_responses, quip_client):
         """Test successful document metadata retrieval."""
-        client = QuipAPIClient("test_token")
-        
         mock_response = {
             "thread": {
                 "id": "doc123",
@@ -136,134 +108,98 @@ class TestQuipAPIClient:
             }
         }
         
-        responses.add(
+        mocked_responses.add(
             responses.GET,
-            "https://platform.quip.com/1/threads/doc123",
+            f"{quip_client.base_url}/threads/doc123",
             json=mock_response,
             status=200
         )
         
-        content = client.get_document_metadata("doc123")
+        content = quip_client.get_document_metadata("doc123")
         
         assert isinstance(content, DocumentContent)
         assert content.title == "Test Document"
         assert content.format == "quip"
     
-    @responses.activate
-    def test_export_document_to_docx_success(self, temp_dir):
+    def test_export_document_to_docx_success(self, mocked_responses, quip_client, tmp_path):
         """Test successful document export."""
-        client = QuipAPIClient("test_token")
-        
         mock_docx_content = b"Mock DOCX content"
         
-        responses.add(
+        mocked_responses.add(
             responses.GET,
-            "https://platform.quip.com/1/threads/doc123/export/docx",
+            f"{quip_client.base_url}/threads/doc123/export/docx",
             body=mock_docx_content,
             status=200
         )
         
-        file_path = f"{temp_dir}/test_document.docx"
-        success = client.export_document_to_docx("doc123", file_path)
+        file_path = tmp_path / "test_document.docx"
+        success = quip_client.export_document_to_docx("doc123", str(file_path))
         
         assert success is True
         
         # Verify file was created with correct content
-        with open(file_path, "rb") as f:
-            content = f.read()
-        assert content == mock_docx_content
+        assert file_path.read_bytes() == mock_docx_content
     
-    @responses.activate
-    def test_export_document_to_docx_failure(self, temp_dir):
+    def test_export_document_to_docx_failure(self, mocked_responses, quip_client_no_retries, tmp_path):
         """Test failed document export."""
-        client = QuipAPIClient("test_token", max_retries=0)  # Disable retries for this test
-        
-        responses.add(
+        mocked_responses.add(
             responses.GET,
-            "https://platform.quip.com/1/threads/doc123/export/docx",
+            f"{quip_client_no_retries.base_url}/threads/doc123/export/docx",
             json={"error": "Export failed"},
             status=500
         )
         
-        file_path = f"{temp_dir}/test_document.docx"
+        file_path = tmp_path / "test_document.docx"
         
         with pytest.raises(QuipAPIError, match="Network error while exporting document"):
-            client.export_document_to_docx("doc123", file_path)
+            quip_client_no_retries.export_document_to_docx("doc123", str(file_path))
     
-    def test_is_folder(self):
-        """Test folder detection."""
-        client = QuipAPIClient("test_token")
-        
-        folder_item = {"folder_id": "folder123", "title": "Test Folder"}
-        document_item = {"thread_id": "doc123", "title": "Test Document"}
-        
-        assert client.is_folder(folder_item) is True
-        assert client.is_folder(document_item) is False
-    
-    def test_is_document(self):
-        """Test document detection."""
-        client = QuipAPIClient("test_token")
-        
-        folder_item = {"folder_id": "folder123", "title": "Test Folder"}
-        document_item = {"thread_id": "doc123", "title": "Test Document"}
-        
-        assert client.is_document(folder_item) is False
-        assert client.is_document(document_item) is True
+    @pytest.mark.parametrize("item,is_folder,is_document", [
+        ({"folder_id": "folder123", "title": "Test Folder"}, True, False),
+        ({"thread_id": "doc123", "title": "Test Document"}, False, True),
+    ], ids=["folder", "document"])
+    def test_item_classification(self, quip_client, item, is_folder, is_document):
+        """Test folder and document detection."""
+        assert quip_client.is_folder(item) is is_folder
+        assert quip_client.is_document(item) is is_document
     
-    @responses.activate
-    def test_test_connection_success(self):
+    def test_test_connection_success(self, base_mocks, quip_client):
         """Test successful connection test."""
-        client = QuipAPIClient("test_token")
-        
-        responses.add(
-            responses.GET,
-            "https://platform.quip.com/1/users/current",
-            json={"user": {"id": "user123"}},
-            status=200
-        )
-        
-        success, message = client.test_connection()
+        success, message = quip_client.test_connection()
         
         assert success is True
         assert message == "Connection successful"
     
-    @responses.activate
-    def test_test_connection_auth_failure(self):
+    def test_test_connection_auth_failure(self, base_mocks, quip_client):
         """Test connection test with authentication failure."""
-        client = QuipAPIClient("test_token")
-        
-        responses.add(
+        base_mocks.replace(
             responses.GET,
-            "https://platform.quip.com/1/users/current",
+            f"{quip_client.base_url}/users/current",
             json={"error": "Unauthorized"},
             status=401
         )
         
-        success, message = client.test_connection()
+        success, message = quip_client.test_connection()
         
         assert success is False
         assert "Authentication failed" in message
     
-    def test_parse_folder_contents_empty(self):
+    def test_parse_folder_contents_empty(self, quip_client):
         """Test parsing empty folder contents."""
-        client = QuipAPIClient("test_token")
-        
         data = {
             "folder": {"id": "folder123", "title": "Empty Folder"},
             "children": []
         }
         
-        contents = client._parse_folder_contents(data)
+        contents = quip_client._parse_folder_contents(data)
         
         assert len(contents.folders) == 0
         assert len(contents.documents) == 0
         assert contents.is_empty() is True
         assert contents.folder_name == "Empty Folder"
     
-    def test_parse_folder_contents_mixed(self):
+    def test_parse_folder_contents_mixed(self, quip_client):
         """Test parsing folder contents with mixed items."""
-        client = QuipAPIClient("test_token")
-        
         data = {
             "folder": {"id": "folder123", "title": "Mixed Folder"},
             "children": [
@@ -274,7 +210,7 @@ class TestQuipAPIClient:
             ]
         }
         
-        contents = client._parse_folder_contents(data)
+        contents = quip_client._parse_folder_contents(data)
         
         assert len(contents.folders) == 2
         assert len(contents.documents) == 2
@@ -288,4 +224,83 @@ class TestQuipAPIClient:
         # Check document items
         doc_ids = [d.id for d in contents.documents]
         assert "doc1" in doc_ids
-        assert "doc2" in doc_ids
\ No newline at end of file
+        assert "doc2" in doc_ids
+
+
+class TestFolderCache:
+    """Test cases for ETag-revalidated folder listings."""
+    
+    def test_not_modified_folder_uses_cached_listing(self, mocked_responses, tmp_path):
+        """Test that a 304 response is answered from the cache."""
+        cache = FolderCache(str(tmp_path / FolderCache.FILENAME))
+        client = QuipAPIClient("test_token", folder_cache=cache)
+        url = f"{client.base_url}/folders/folder123"
+        
+        mocked_responses.add(
+            responses.GET, url,
+            json={"folder": {"id": "folder123", "title": "Cached"}, "children": [{"thread_id": "doc123", "title": "Doc"}]},
+            headers={"ETag": '"v1"'},
+            status=200
+        )
+        mocked_responses.add(responses.GET, url, status=304)
+        
+        first = client.get_folder_contents("folder123")
+        second = client.get_folder_contents("folder123")
+        cache.close()
+        
+        assert mocked_responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+        assert second == first
+        assert second.folder_name == "Cached"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+
+class TestRateLimiter:
+    """Test cases for RateLimiter."""
+    
+    def test_burst_within_capacity_does_not_wait(self, mocker):
+        """Test that requests up to capacity are granted immediately."""
+        limiter = RateLimiter(5, period=60.0)
+        mock_sleep = mocker.patch("quip_mirror.quip_client.time.sleep")
+        
+        for _ in range(5):
+            limiter.acquire()
+        
+        mock_sleep.assert_not_called()
+    
+    def test_waits_when_bucket_is_empty(self, mocker):
+        """Test that a request beyond capacity waits for a refill."""
+        limiter = RateLimiter(2, period=60.0)
+        limiter.acquire()
+        limiter.acquire()
+        
+        def fake_sleep(seconds):
+            # Simulate the passage of time by refilling the bucket
+            limiter._tokens += seconds * limiter.fill_rate
+        
+        mock_sleep = mocker.patch("quip_mirror.quip_client.time.sleep", side_effect=fake_sleep)
+        limiter.acquire()
+        
+        assert mock_sleep.call_count == 1
+        assert mock_sleep.call_args[0][0] == pytest.approx(30.0, rel=0.01)
+    
+    def test_fractional_rate_still_grants_requests(self, mocker):
+        """Test that rates below one request per period still make progress."""
+        limiter = RateLimiter(0.5, period=1.0)
+        mock_sleep = mocker.patch("quip_mirror.quip_client.time.sleep")
+        
+        limiter.acquire()
+        
+        mock_sleep.assert_not_called()
+    
+    def test_invalid_rate(self):
+        """Test that a non-positive rate is rejected."""
+        with pytest.raises(ValueError):
+            RateLimiter(0)
+    
+    def test_client_without_limit(self):
+        """Test that clients are unthrottled by default."""
+        client = QuipAPIClient("test_token")
+        assert client.rate_limiter is None
+        
+        client = QuipAPIClient("test_token", requests_per_minute=90)
+        assert isinstance(client.rate_limiter, RateLimiter)
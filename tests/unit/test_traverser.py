@@ -0,0 +1,94 @@
+"""
+Unit tests for the folder traverser.
+"""
+
+from unittest.mock import Mock
+from quip_mirror.traverser import FolderTraverser
+from quip_mirror.models import FolderContents, QuipItem
+from quip_mirror.quip_client import QuipAPIError
+
+
+class TestFolderTraverser:
+    """Test cases for FolderTraverser."""
+    
+    # folder ID -> (subfolder IDs, document IDs); "root" is reachable from "b"
+    TREE = {
+        "root": (["a", "b", "missing"], ["doc1"]),
+        "a": (["c"], ["doc2"]),
+        "b": (["root"], []),
+        "c": ([], ["doc3"]),
+    }
+    
+    def _make_client(self):
+        def contents(folder_id):
+            if folder_id not in self.TREE:
+                raise QuipAPIError(f"Folder {folder_id} not found.", 404)
+            folders, documents = self.TREE[folder_id]
+            return FolderContents(
+                folders=[QuipItem(id=f, name=f.upper(), type="folder", url=f"https://quip-amazon.com/{f}") for f in folders],
+                documents=[QuipItem(id=d, name=d, type="document", url=f"https://quip-amazon.com/{d}") for d in documents],
+                folder_name=folder_id.upper()
+            )
+        
+        client = Mock()
+        client.get_folder_contents.side_effect = contents
+        return client
+    
+    def test_traverse_builds_hierarchy_in_listing_order(self):
+        """Test concurrent traversal, skipping failed and circular folders."""
+        client = self._make_client()
+        traverser = FolderTraverser(client)
+        
+        hierarchy = traverser.traverse("root")
+        
+        assert list(hierarchy.subfolders) == ["a", "b"]
+        assert hierarchy.subfolders["b"].subfolders["root"].root_folder.name == "Circular Reference: root"
+        assert [(d.relative_path, d.item.id) for d in hierarchy.get_all_documents()] == [
+            ("ROOT", "doc1"), ("ROOT/A", "doc2"), ("ROOT/A/C", "doc3")
+        ]
+        assert client.get_folder_contents.call_count == 5
+        assert [folder_id for folder_id, _, _ in traverser.failed_folders] == ["missing"]
+    
+    def test_traverse_respects_max_depth(self):
+        """Test that folders beyond the maximum depth are not fetched."""
+        client = self._make_client()
+        
+        hierarchy = FolderTraverser(client, max_depth=1).traverse("root")
+        
+        assert hierarchy.total_folders == 3
+        assert client.get_folder_contents.call_count == 4
+    
+    def test_iter_documents_matches_traverse(self):
+        """Test that streamed documents match those of the full hierarchy."""
+        traverser = FolderTraverser(self._make_client())
+        
+        streamed = sorted((d.relative_path, d.item.id) for d in traverser.iter_documents("root"))
+        hierarchy = traverser.traverse("root")
+        
+        assert streamed == [(d.relative_path, d.item.id) for d in hierarchy.get_all_documents()]
+    
+    def test_traversal_stats(self):
+        """Test that statistics are computed from the traversed hierarchy."""
+        traverser = FolderTraverser(self._make_client())
+        hierarchy = traverser.traverse("root")
+        
+        assert traverser.get_traversal_stats(hierarchy) == {
+            "total_folders": 5,
+            "total_documents": 3,
+            "max_depth": 2,
+            "empty_folders": 1
+        }
+    
+    def test_validation_is_cached_until_stats_refresh(self):
+        """Test that repeated validation reuses the cached result."""
+        traverser = FolderTraverser(self._make_client())
+        hierarchy = traverser.traverse("root")
+        traverser._check_large_folders = Mock()
+        
+        traverser.validate_hierarchy(hierarchy)
+        traverser.validate_hierarchy(hierarchy)
+        assert traverser._check_large_folders.call_count == 1
+        
+        hierarchy.compute_stats()
+        traverser.validate_hierarchy(hierarchy)
+        assert traverser._check_large_folders.call_count == 2